@@ -10,7 +10,6 @@ import logging
 import os
 
 from src.app_service import AppService
-from src.ui.dashboard import Dashboard
 
 
 def main() -> None:
@@ -19,16 +18,25 @@ def main() -> None:
     Logging defaults to ``INFO`` to surface operational events such as fetch
     runs and scheduler activity. Set the ``LOG_LEVEL`` environment variable to
     ``DEBUG`` to see per-request diagnostics emitted throughout the codebase.
+
+    The dashboard (Tkinter + Matplotlib) is imported only once logging is
+    configured, so UI import errors are logged and importing this module
+    stays cheap for headless tooling.
     """
 
     logging.basicConfig(
-        level=getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO),
+        level=logging.getLevelNamesMapping().get(os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO),
         format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
     )
 
     service = AppService()
+    from src.ui.dashboard import Dashboard
+
     root = Dashboard(service)
-    root.mainloop()
+    try:
+        root.mainloop()
+    finally:
+        service.shutdown()
 
 
 if __name__ == "__main__":
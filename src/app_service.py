@@ -1,19 +1,22 @@
 """Orchestration layer tying sources, storage, and transforms together."""
 
 import threading
-import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
-from typing import Callable, Optional
+from typing import Callable, Dict, Optional
 import logging
 
+from src.sources.base import close_session
 from src.sources.openmeteo import OpenMeteoSource
 from src.sources.worldbank import WorldBankSource
-from src.sources.wikipedia import WikipediaScraper
+from src.sources.wikipedia import WikipediaScraper, dump_parse_cache, load_parse_cache
 from src.storage.mongo_storage import MongoStorage
 from src.storage.sqlite_storage import SQLiteStorage
 from src.transform.environment import transform_environment
 from src.transform.macro import transform_macro
 from src.config import config
+from src.scheduler import RepeatedScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -24,21 +27,57 @@ class AppService:
     def __init__(self) -> None:
         self.mongo = MongoStorage()
         self.sqlite = SQLiteStorage()
-        self.openmeteo = OpenMeteoSource()
-        self.worldbank = WorldBankSource()
-        self.wikipedia = WikipediaScraper()
-        self._scheduler_thread: Optional[threading.Thread] = None
-        self._stop_event = threading.Event()
+        # Shared pool for the network-bound requests issued by every source.
+        self._executor = ThreadPoolExecutor(max_workers=config.FETCH_MAX_WORKERS, thread_name_prefix="fetch")
+        # Fetch phases may run concurrently; serialize their writes to storage.
+        self._persist_lock = threading.Lock()
+        self.openmeteo = OpenMeteoSource(self._executor)
+        self.worldbank = WorldBankSource(self._executor)
+        # Wikipedia HTML parsing is CPU-bound; a small process pool keeps it off
+        # the GIL. "spawn" avoids forking a process that already runs threads.
+        self._parse_pool = ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn"))
+        self.wikipedia = WikipediaScraper(self._executor, self._parse_pool)
+        load_parse_cache(self.sqlite.load_wiki_parse_cache())
         self._status_callback: Optional[Callable[[str], None]] = None
+        self._data_callback: Optional[Callable[[str], None]] = None
         self.env_interval = config.ENV_REFRESH_INTERVAL
         self.macro_interval = config.MACRO_REFRESH_INTERVAL
         self.wiki_interval = config.WIKI_REFRESH_INTERVAL
+        # One self-rescheduling timer per source, so each fires exactly on its
+        # own cadence with no polling thread in between. Scheduling a new
+        # source is one more entry here.
+        self._schedules: Dict[str, RepeatedScheduler] = {
+            name: RepeatedScheduler(interval, self._scheduled(message, fetch))
+            for name, interval, message, fetch in (
+                ("environment", self.env_interval, "Scheduler: triggering environment fetch", self.fetch_environment),
+                ("macro", self.macro_interval, "Scheduler: triggering macro fetch", self.fetch_macro),
+                ("wikipedia", self.wiki_interval, "Scheduler: triggering Wikipedia refresh", self.fetch_wikipedia),
+            )
+        }
 
     def set_status_callback(self, callback: Callable[[str], None]) -> None:
         """Register a UI-friendly callback for status updates."""
 
         self._status_callback = callback
 
+    def set_data_callback(self, callback: Callable[[str], None]) -> None:
+        """Register a callback invoked with a source name after its run is committed.
+
+        It fires for failed runs too, since those still add a source log row.
+        """
+
+        self._data_callback = callback
+
+    def _data_changed(self, name: str) -> None:
+        """Notify the data callback; a failing listener never affects the run's outcome."""
+
+        if not self._data_callback:
+            return
+        try:
+            self._data_callback(name)
+        except Exception:  # noqa: BLE001
+            logger.exception("Data callback for %s failed", name)
+
     def _notify(self, message: str) -> None:
         """Send a message to the UI layer and log it for debugging."""
 
@@ -46,16 +85,36 @@ class AppService:
         if self._status_callback:
             self._status_callback(message)
 
-    def fetch_all(self) -> None:
-        """Fetch all sources in sequence and log aggregate success."""
+    def _scheduled(self, message: str, fetch: Callable[[], object]) -> Callable[[], None]:
+        """Wrap a fetch so scheduler ticks are announced in the status bar."""
+
+        def run() -> None:
+            self._notify(message)
+            fetch()
+
+        return run
 
+    def fetch_all(self, force_refresh: bool = False) -> None:
+        """Fetch all sources concurrently and log aggregate success.
+
+        The phases run on their own small pool rather than ``self._executor``:
+        each phase blocks on requests submitted to the shared pool, so running
+        both levels on one bounded pool could starve it. ``force_refresh``
+        revalidates cached HTTP responses (used by the manual fetch button).
+        """
+
+        # One timestamp for the whole run: source logs and every fetched payload share it.
         started = datetime.now(timezone.utc).isoformat()
         self._notify("Running data fetch...")
         ok = True
         try:
-            self.fetch_environment()
-            self.fetch_macro()
-            self.fetch_wikipedia()
+            phases = (self.fetch_environment, self.fetch_macro, self.fetch_wikipedia)
+            with ThreadPoolExecutor(max_workers=len(phases), thread_name_prefix="fetch-phase") as pool:
+                futures = [pool.submit(phase, force_refresh, started) for phase in phases]
+                wait(futures)
+            errors = [future.exception() for future in futures if future.exception() is not None]
+            if errors:
+                raise errors[0]
             self._notify("Fetch complete")
             self.sqlite.log_run(started, datetime.now(timezone.utc).isoformat(), True, "ok")
         except Exception as exc:  # noqa: BLE001
@@ -76,110 +135,122 @@ class AppService:
             item_count=count,
         )
 
-    def fetch_environment(self):
+    def fetch_environment(self, force_refresh: bool = False, run_started_iso: Optional[str] = None):
         """Fetch and transform weather + air quality data."""
 
-        started = datetime.now(timezone.utc).isoformat()
+        started = run_started_iso or datetime.now(timezone.utc).isoformat()
         self._notify("Fetching environment data...")
         try:
-            weather_results = self.openmeteo.fetch()
-            for res in weather_results:
+            weather_results = self.openmeteo.fetch(force_refresh, started)
+            with self._persist_lock:
                 if self.mongo.available:
-                    self.mongo.log_fetch(res)
-            transform_environment(weather_results, self.sqlite)
-            self._log_source_run("environment", started, True, "ok", len(weather_results))
+                    self.mongo.log_fetch_many(weather_results)
+                with self.sqlite.transaction():
+                    transform_environment(weather_results, self.sqlite)
+                    self._log_source_run("environment", started, True, "ok", len(weather_results))
+            self._data_changed("environment")
             self._notify(f"Environment updated ({len(weather_results)} payloads)")
             return weather_results
         except Exception as exc:  # noqa: BLE001
-            self._log_source_run("environment", started, False, str(exc), 0)
+            with self._persist_lock:
+                self._log_source_run("environment", started, False, str(exc), 0)
+            self._data_changed("environment")
             self._notify(f"Environment failed: {exc}")
             logger.exception("Environment fetch failed")
             raise
 
-    def fetch_macro(self):
+    def fetch_macro(self, force_refresh: bool = False, run_started_iso: Optional[str] = None):
         """Fetch and transform macro indicators."""
 
-        started = datetime.now(timezone.utc).isoformat()
+        started = run_started_iso or datetime.now(timezone.utc).isoformat()
         self._notify("Fetching macro data...")
         try:
-            macro_results = self.worldbank.fetch()
-            for res in macro_results:
+            macro_results = self.worldbank.fetch(force_refresh, started)
+            with self._persist_lock:
                 if self.mongo.available:
-                    self.mongo.log_fetch(res)
-            transform_macro(macro_results, self.sqlite)
-            self._log_source_run("macro", started, True, "ok", len(macro_results))
+                    self.mongo.log_fetch_many(macro_results)
+                with self.sqlite.transaction():
+                    transform_macro(macro_results, self.sqlite)
+                    self._log_source_run("macro", started, True, "ok", len(macro_results))
+            self._data_changed("macro")
             self._notify(f"Macro updated ({len(macro_results)} payloads)")
             return macro_results
         except Exception as exc:  # noqa: BLE001
-            self._log_source_run("macro", started, False, str(exc), 0)
+            with self._persist_lock:
+                self._log_source_run("macro", started, False, str(exc), 0)
+            self._data_changed("macro")
             self._notify(f"Macro failed: {exc}")
             logger.exception("Macro fetch failed")
             raise
 
-    def fetch_wikipedia(self):
+    def fetch_wikipedia(self, force_refresh: bool = False, run_started_iso: Optional[str] = None):
         """Fetch and persist Wikipedia enrichments."""
 
-        started = datetime.now(timezone.utc).isoformat()
+        started = run_started_iso or datetime.now(timezone.utc).isoformat()
         self._notify("Refreshing Wikipedia summaries...")
         try:
-            scrape_results = self.wikipedia.scrape_all()
-            for sres in scrape_results:
+            scrape_results = self.wikipedia.scrape_all(force_refresh, started)
+            with self._persist_lock:
+                keys_by_url = self.sqlite.location_keys_by_wiki_url()
                 if self.mongo.available:
-                    self.mongo.log_scrape(sres)
-                if sres.ok and sres.parsed:
-                    for loc in self.sqlite.conn.execute(
-                        "SELECT location_key, wikipedia_url FROM dim_location WHERE wikipedia_url=?",
-                        (sres.url,),
-                    ):
-                        self.sqlite.update_location_wiki(loc[0], sres.parsed.get("title"), sres.parsed.get("summary"))
-            self._log_source_run("wikipedia", started, True, "ok", len(scrape_results))
+                    self.mongo.log_scrape_many(scrape_results)
+                wiki_rows = []
+                for sres in scrape_results:
+                    if sres.ok and sres.parsed:
+                        wiki_rows.extend(
+                            (sres.parsed.get("title"), sres.parsed.get("summary"), location_key)
+                            for location_key in keys_by_url.get(sres.url, ())
+                        )
+                with self.sqlite.transaction():
+                    self.sqlite.update_locations_wiki(wiki_rows)
+                    self._log_source_run("wikipedia", started, True, "ok", len(scrape_results))
+            self._data_changed("wikipedia")
             self._notify(f"Wikipedia updated ({len(scrape_results)} pages)")
             return scrape_results
         except Exception as exc:  # noqa: BLE001
-            self._log_source_run("wikipedia", started, False, str(exc), 0)
+            with self._persist_lock:
+                self._log_source_run("wikipedia", started, False, str(exc), 0)
+            self._data_changed("wikipedia")
             self._notify(f"Wikipedia failed: {exc}")
             logger.exception("Wikipedia fetch failed")
             raise
 
     def start_scheduler(self) -> None:
-        if self._scheduler_thread and self._scheduler_thread.is_alive():
+        if self.is_scheduler_running():
             return
-        self._stop_event.clear()
-        self._scheduler_thread = threading.Thread(target=self._run_scheduler, daemon=True)
-        self._scheduler_thread.start()
+        for scheduler in self._schedules.values():
+            scheduler.start()
         self._notify("Scheduler started")
 
-    def _run_scheduler(self) -> None:
-        next_env = time.time()
-        next_macro = time.time()
-        next_wiki = time.time()
-        while not self._stop_event.is_set():
-            now = time.time()
-            if now >= next_env:
-                self._notify("Scheduler: triggering environment fetch")
-                self.fetch_environment()
-                next_env = now + self.env_interval
-            if now >= next_macro:
-                self._notify("Scheduler: triggering macro fetch")
-                self.fetch_macro()
-                next_macro = now + self.macro_interval
-            if now >= next_wiki:
-                self._notify("Scheduler: triggering Wikipedia refresh")
-                self.fetch_wikipedia()
-                next_wiki = now + self.wiki_interval
-            time.sleep(5)
-
     def stop_scheduler(self) -> None:
-        self._stop_event.set()
+        for scheduler in self._schedules.values():
+            scheduler.stop()
         self._notify("Scheduler stopped")
 
     def is_scheduler_running(self) -> bool:
-        return bool(self._scheduler_thread and self._scheduler_thread.is_alive())
+        return any(scheduler.running() for scheduler in self._schedules.values())
+
+    def shutdown(self) -> None:
+        """Stop background work, persist caches, and release pooled resources."""
+
+        if self.is_scheduler_running():
+            self.stop_scheduler()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._parse_pool.shutdown(wait=False, cancel_futures=True)
+        close_session()
+        with self._persist_lock:
+            self.sqlite.save_wiki_parse_cache(dump_parse_cache())
+            # Flushes buffered run-log rows and refreshes planner statistics.
+            self.sqlite.close()
 
     def update_intervals(self, env_seconds: int, macro_seconds: int, wiki_seconds: int) -> None:
+        """Change scheduler cadences; running timers pick them up after their next tick."""
+
         self.env_interval = env_seconds
         self.macro_interval = macro_seconds
         self.wiki_interval = wiki_seconds
+        for name, seconds in (("environment", env_seconds), ("macro", macro_seconds), ("wikipedia", wiki_seconds)):
+            self._schedules[name].interval = seconds
         self._notify(
             f"Intervals updated (env: {env_seconds}s, macro: {macro_seconds}s, wiki: {wiki_seconds}s)"
         )
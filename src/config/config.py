@@ -8,7 +8,7 @@ validating which locations, indicators, or scheduler intervals are active.
 
 import os
 from dataclasses import dataclass
-from typing import List
+from typing import Tuple
 
 DB_NAME = "ecopulse"
 # Persist SQLite database in the repository root so it is easy to inspect and
@@ -18,6 +18,9 @@ SQLITE_FILE = os.path.join(
     "..",
     "ecopulse.sqlite",
 )
+# HTTP response cache lives next to the SQLite database (".sqlite" is appended
+# by requests-cache).
+HTTP_CACHE_FILE = os.path.join(os.path.dirname(SQLITE_FILE), "ecopulse_http")
 # MongoDB URI is overridable for debugging against a remote instance.
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
 
@@ -35,11 +38,11 @@ class Location:
     lon: float
     wikipedia_url: str
 
-LOCATIONS: List[Location] = [
+LOCATIONS: Tuple[Location, ...] = (
     Location("ams", "Amsterdam", 52.3676, 4.9041, "https://en.wikipedia.org/wiki/Amsterdam"),
     Location("bru", "Brussels", 50.8503, 4.3517, "https://en.wikipedia.org/wiki/Brussels"),
     Location("nyc", "New York City", 40.7128, -74.0060, "https://en.wikipedia.org/wiki/New_York_City"),
-]
+)
 
 WB_INDICATORS = {
     # code -> user-friendly label displayed in the UI
@@ -57,11 +60,24 @@ WB_REGIONS = {
     "WLD": "World",
 }
 
+# Precomputed path segments for World Bank URLs (``NLD;EUU;USA;WLD`` etc.).
+WB_COUNTRIES_PATH: str = ";".join(WB_REGIONS)
+WB_SERIES_PATH: str = ";".join(WB_INDICATORS)
+
 USER_AGENT = "EcoPulseDashboard/1.0"
 REQUEST_TIMEOUT = 10
-# Retry a couple of times to make transient network failures easier to debug
-# without failing the entire fetch run at the first hiccup.
+# Retry a couple of times (with backoff) to ride out transient network failures
+# and throttling without failing the entire fetch run at the first hiccup.
 MAX_RETRIES = 2
+# Cache lifetime (seconds) per host; upstream Cache-Control headers win when
+# present. Matches the scheduler cadence so ticks mostly hit the cache.
+HTTP_CACHE_EXPIRE_AFTER = {
+    "api.worldbank.org": 86400,
+    "en.wikipedia.org": 604800,
+    "*.open-meteo.com": 1800,
+}
+# Upper bound on requests in flight at once across all sources during a fetch.
+FETCH_MAX_WORKERS = int(os.getenv("FETCH_MAX_WORKERS", 16))
 
 # Scheduler defaults (in seconds)
 ENV_REFRESH_INTERVAL = int(os.getenv("ENV_REFRESH_INTERVAL", 3600))
@@ -20,7 +20,13 @@ class RepeatedScheduler:
         if not self._running:
             return
         logger.debug("Scheduler tick: running %s", self.func)
-        self.func()
+        try:
+            self.func()
+        except Exception:  # noqa: BLE001
+            # Keep the cadence alive; the failure is already logged by the callee.
+            logger.debug("Scheduled call %s raised", self.func, exc_info=True)
+        if not self._running:
+            return
         self._timer = threading.Timer(self.interval, self._run)
         self._timer.daemon = True
         self._timer.start()
@@ -6,24 +6,61 @@ individual sources small and debuggable while ensuring consistent logging and
 retry behavior across the board.
 """
 
+from concurrent.futures import Executor
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
 import logging
 import time
-import requests
+import orjson
 from requests import Response
+from requests.adapters import HTTPAdapter
+from requests_cache import DO_NOT_CACHE, CachedSession
+from urllib3.util import Retry
 from src.config import config
 
 logger = logging.getLogger(__name__)
 
-
-@dataclass
+# One keep-alive session for every source so repeated requests to the same host
+# (within a fetch run and across scheduler ticks) skip the TCP/TLS handshake.
+# Responses are cached on disk per host and revalidated via ETag /
+# Last-Modified when they expire; a stale copy is served if the upstream errors.
+_SESSION = CachedSession(
+    cache_name=config.HTTP_CACHE_FILE,
+    backend="sqlite",
+    expire_after=DO_NOT_CACHE,
+    urls_expire_after=config.HTTP_CACHE_EXPIRE_AFTER,
+    cache_control=True,
+    stale_if_error=True,
+)
+_SESSION.headers["User-Agent"] = config.USER_AGENT
+# urllib3 retries connection errors and throttling/5xx responses with jittered
+# exponential backoff, honoring Retry-After. After the last attempt the final
+# response is returned as-is (raise_on_status=False) so callers can log it.
+_RETRY = Retry(
+    total=config.MAX_RETRIES,
+    backoff_factor=0.5,
+    backoff_jitter=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["GET"],
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+_ADAPTER = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=_RETRY)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass(slots=True, frozen=True)
 class RawFetchResult:
     """Normalized representation of an HTTP API response.
 
     Fields are intentionally verbose to simplify debugging: every fetch caller
     includes the URL, query parameters, timing, and both parsed and raw payload
-    for inspection or replaying requests.
+    for inspection or replaying requests. Instances are slotted and immutable:
+    results are built once by a source and only read afterwards.
     """
 
     source: str
@@ -34,11 +71,18 @@ class RawFetchResult:
     error: Optional[str]
     duration_ms: int
     payload_json: Optional[Any]
+    # Raw body, kept only when the request failed (``payload_json`` carries
+    # successful payloads, so storing both would double memory).
     payload_text: Optional[str]
     fetched_at_utc: str
+    # Parsed form of ``source`` set by the producing source (e.g. "weather" and
+    # a location key, or a World Bank indicator code) so transforms need not
+    # split the name again.
+    subtype: Optional[str] = None
+    entity_key: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScrapeResult:
     """Normalized representation of an HTML scrape.
 
@@ -56,39 +100,78 @@ class ScrapeResult:
 
 
 class DataSource:
-    """Interface implemented by every HTTP data source."""
+    """Interface implemented by every HTTP data source.
+
+    Sources accept an optional ``executor`` so the orchestrator can overlap
+    their network-bound requests; without one they run sequentially, which is
+    handy when stepping through a single source in a debugger.
+    """
 
     name: str
 
-    def fetch(self) -> list[RawFetchResult]:
-        """Retrieve payloads and return normalized results."""
+    def __init__(self, executor: Optional[Executor] = None) -> None:
+        self.executor = executor
+
+    def fetch(self, force_refresh: bool = False, run_started_iso: Optional[str] = None) -> list[RawFetchResult]:
+        """Retrieve payloads and return normalized results.
+
+        ``force_refresh`` revalidates cached HTTP responses for this call. ``run_started_iso``
+        is the fetch run's timestamp, stamped on every result as
+        ``fetched_at_utc`` (the current time when called standalone).
+        """
 
         raise NotImplementedError
 
 
-def _do_request(url: str, params: Dict[str, Any]) -> tuple[Optional[Response], Optional[str], int]:
+def _map(executor: Optional[Executor], func: Callable[[T], R], items: Iterable[T]) -> List[R]:
+    """Apply ``func`` to ``items`` on ``executor`` (if any), preserving order."""
+
+    if executor is None:
+        return [func(item) for item in items]
+    return list(executor.map(func, items))
+
+
+def _parse_json(resp: Response) -> Any:
+    """Decode a JSON response body with orjson (faster than ``resp.json()``)."""
+
+    return orjson.loads(resp.content)
+
+
+def _do_request(
+    url: str, params: Dict[str, Any], force_refresh: bool = False
+) -> tuple[Optional[Response], Optional[str], int]:
     """Perform a GET request with retries and basic diagnostics.
 
     The function returns the ``requests.Response`` (if any), an error message
     (``None`` on success), and the total duration in milliseconds. The
     triple-return shape is convenient for logging raw results to MongoDB while
     keeping transformation code decoupled from network concerns.
+
+    ``force_refresh`` revalidates any cached copy with the server: the
+    request carries ``If-None-Match``/``If-Modified-Since`` when validators
+    are known, so unchanged resources come back as a bodiless 304.
     """
 
-    headers = {"User-Agent": config.USER_AGENT}
-    start = time.time()
-    resp: Optional[Response] = None
-    error = None
-    for attempt in range(config.MAX_RETRIES + 1):
-        try:
-            logger.debug("GET %s params=%s attempt=%s", url, params, attempt + 1)
-            resp = requests.get(url, params=params, headers=headers, timeout=config.REQUEST_TIMEOUT)
-            logger.debug("Response %s in %sms", resp.status_code if resp else "?", int((time.time() - start) * 1000))
-            return resp, None, int((time.time() - start) * 1000)
-        except Exception as exc:  # noqa: BLE001
-            error = str(exc)
-            logger.warning("Request error (attempt %s/%s): %s", attempt + 1, config.MAX_RETRIES + 1, error)
-            time.sleep(1 + attempt)
-    duration_ms = int((time.time() - start) * 1000)
-    logger.error("Failed GET %s after %sms: %s", url, duration_ms, error)
-    return resp, error, duration_ms
+    start = time.monotonic()
+    try:
+        logger.debug("GET %s params=%s", url, params)
+        resp = _SESSION.get(url, params=params, timeout=config.REQUEST_TIMEOUT, refresh=force_refresh)
+    except Exception as exc:  # noqa: BLE001
+        # Retries (see ``_RETRY``) are exhausted or the error is not retryable.
+        duration_ms = int((time.monotonic() - start) * 1000)
+        logger.error("Failed GET %s after %sms: %s", url, duration_ms, exc)
+        return None, str(exc), duration_ms
+    duration_ms = int((time.monotonic() - start) * 1000)
+    logger.debug(
+        "Response %s in %sms (from_cache=%s)",
+        resp.status_code,
+        duration_ms,
+        getattr(resp, "from_cache", False),
+    )
+    return resp, None, duration_ms
+
+
+def close_session() -> None:
+    """Close pooled HTTP connections (call once on application shutdown)."""
+
+    _SESSION.close()
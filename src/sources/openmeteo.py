@@ -1,11 +1,12 @@
 """Fetch hourly environment metrics from the Open-Meteo API."""
 
 from datetime import datetime, timezone
-from typing import List
+from functools import partial
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 import logging
 
 from src.config import config
-from src.sources.base import DataSource, RawFetchResult, _do_request
+from src.sources.base import DataSource, RawFetchResult, _do_request, _map, _parse_json
 
 logger = logging.getLogger(__name__)
 
@@ -15,66 +16,71 @@ class OpenMeteoSource(DataSource):
 
     name = "open-meteo"
 
-    def fetch(self) -> List[RawFetchResult]:
-        """Fetch both weather and air payloads for every tracked location."""
+    WEATHER_URL = "https://api.open-meteo.com/v1/forecast"
+    WEATHER_PARAMS = {"hourly": "temperature_2m,wind_speed_10m,precipitation", "timezone": "UTC"}
+    AIR_URL = "https://air-quality-api.open-meteo.com/v1/air-quality"
+    AIR_PARAMS = {"hourly": "pm2_5,pm10,european_aqi,us_aqi", "timezone": "UTC"}
 
-        results: List[RawFetchResult] = []
-        for loc in config.LOCATIONS:
-            logger.info("Fetching Open-Meteo data for %s", loc.key)
-            results.extend(self._fetch_for_location(loc.key, loc.lat, loc.lon))
-        return results
+    def fetch(self, force_refresh: bool = False, run_started_iso: Optional[str] = None) -> List[RawFetchResult]:
+        """Fetch both weather and air payloads for every tracked location.
 
-    def _fetch_for_location(self, location_key: str, lat: float, lon: float) -> List[RawFetchResult]:
-        """Request hourly weather and air quality for a single location."""
+        Open-Meteo accepts comma-separated coordinates and answers with one
+        entry per location, so each category is a single request (the two run
+        concurrently). Results are still emitted per location, weather first.
+        """
 
-        now = datetime.now(timezone.utc).isoformat()
-        outputs: List[RawFetchResult] = []
-
-        weather_url = "https://api.open-meteo.com/v1/forecast"
-        weather_params = {
-            "latitude": lat,
-            "longitude": lon,
-            "hourly": "temperature_2m,wind_speed_10m,precipitation",
-            "timezone": "UTC",
+        now = run_started_iso or datetime.now(timezone.utc).isoformat()
+        locations = config.LOCATIONS
+        coords = {
+            "latitude": ",".join(str(loc.lat) for loc in locations),
+            "longitude": ",".join(str(loc.lon) for loc in locations),
         }
-        resp, error, duration_ms = _do_request(weather_url, weather_params)
-        payload_json = resp.json() if resp and resp.ok else None
-        outputs.append(
-            RawFetchResult(
-                source=f"{self.name}-weather-{location_key}",
-                url=weather_url,
-                params=weather_params,
-                status_code=resp.status_code if resp else None,
-                ok=bool(resp and resp.ok),
-                error=error or (None if resp and resp.ok else (resp.text if resp else None)),
-                duration_ms=duration_ms,
-                payload_json=payload_json,
-                payload_text=resp.text if resp else None,
-                fetched_at_utc=now,
-            )
+        category_requests = [
+            ("weather", self.WEATHER_URL, {**coords, **self.WEATHER_PARAMS}),
+            ("air", self.AIR_URL, {**coords, **self.AIR_PARAMS}),
+        ]
+        fetch_category = partial(
+            self._fetch_category, locations=locations, force_refresh=force_refresh, run_started_iso=now
         )
+        weather, air = _map(self.executor, fetch_category, category_requests)
+        return [result for pair in zip(weather, air) for result in pair]
 
-        air_url = "https://air-quality-api.open-meteo.com/v1/air-quality"
-        air_params = {
-            "latitude": lat,
-            "longitude": lon,
-            "hourly": "pm2_5,pm10,european_aqi,us_aqi",
-            "timezone": "UTC",
-        }
-        resp2, error2, duration_ms2 = _do_request(air_url, air_params)
-        payload_json2 = resp2.json() if resp2 and resp2.ok else None
-        outputs.append(
+    def _fetch_category(
+        self,
+        request: Tuple[str, str, Dict[str, Any]],
+        locations: Sequence[config.Location],
+        force_refresh: bool = False,
+        run_started_iso: Optional[str] = None,
+    ) -> List[RawFetchResult]:
+        """Request one category for all ``locations`` and split it per location."""
+
+        category, url, params = request
+        now = run_started_iso or datetime.now(timezone.utc).isoformat()
+        logger.info("Fetching Open-Meteo %s data for %s", category, ", ".join(loc.key for loc in locations))
+        resp, error, duration_ms = _do_request(url, params, force_refresh)
+        ok = bool(resp and resp.ok)
+        payloads: List[Any] = []
+        if ok:
+            payload = _parse_json(resp)
+            payloads = payload if isinstance(payload, list) else [payload]
+            if len(payloads) != len(locations):
+                ok = False
+                error = f"Expected {len(locations)} locations in response, got {len(payloads)}"
+        text = None if (resp and resp.ok) else (resp.text if resp else None)
+        return [
             RawFetchResult(
-                source=f"{self.name}-air-{location_key}",
-                url=air_url,
-                params=air_params,
-                status_code=resp2.status_code if resp2 else None,
-                ok=bool(resp2 and resp2.ok),
-                error=error2 or (None if resp2 and resp2.ok else (resp2.text if resp2 else None)),
-                duration_ms=duration_ms2,
-                payload_json=payload_json2,
-                payload_text=resp2.text if resp2 else None,
+                source=f"{self.name}-{category}-{loc.key}",
+                url=url,
+                params=params,
+                status_code=resp.status_code if resp else None,
+                ok=ok,
+                error=error or (None if ok else text),
+                duration_ms=duration_ms,
+                payload_json=payloads[idx] if ok else None,
+                payload_text=text,
                 fetched_at_utc=now,
+                subtype=category,
+                entity_key=loc.key,
             )
-        )
-        return outputs
+            for idx, loc in enumerate(locations)
+        ]
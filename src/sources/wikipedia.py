@@ -1,46 +1,138 @@
 """Wikipedia scraper for enriching locations with human-readable summaries."""
 
+from concurrent.futures import Executor
 from datetime import datetime, timezone
-from typing import List
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+import hashlib
 import logging
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 from src.config import config
-from src.sources.base import ScrapeResult, _do_request
+from src.sources.base import ScrapeResult, _do_request, _map, _parse_json
 
 logger = logging.getLogger(__name__)
 
+# url -> (SHA-1 of the page bytes, parsed fields). Unchanged pages reuse the
+# previous parse instead of walking the whole document with BeautifulSoup.
+_PARSE_CACHE: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+
+
+def load_parse_cache(entries: Dict[str, Tuple[str, Dict[str, Any]]]) -> None:
+    """Seed the parse cache, e.g. with entries persisted by a previous run."""
+
+    _PARSE_CACHE.update(entries)
+
+
+def dump_parse_cache() -> Dict[str, Tuple[str, Dict[str, Any]]]:
+    """Return a snapshot of the parse cache for persistence."""
+
+    return dict(_PARSE_CACHE)
+
+
+# Only the title and the first paragraph are extracted, so restrict tree
+# construction to those tags and let libxml2 do the tokenizing.
+_SUMMARY_TAGS = SoupStrainer(["h1", "p"])
+
+# The REST summary endpoint returns the title and lead paragraph as a ~2KB JSON
+# document, versus downloading and parsing the full article HTML.
+SUMMARY_API_URL = "https://{host}/api/rest_v1/page/summary/{title}"
+
+
+def _parse_wiki_html(html: str) -> Dict[str, Any]:
+    """Extract the page title and first paragraph from article HTML.
+
+    Kept at module scope (and free of shared state) so it can be pickled and
+    run in a worker process.
+    """
+
+    soup = BeautifulSoup(html, "lxml", parse_only=_SUMMARY_TAGS)
+    title = soup.find("h1").get_text(strip=True) if soup.find("h1") else ""
+    para = soup.find("p")
+    summary = para.get_text(strip=True) if para else ""
+    return {"title": title, "summary": summary}
+
 
 class WikipediaScraper:
     """Fetch and parse Wikipedia pages for configured locations."""
 
     name = "wikipedia"
 
-    def scrape_all(self) -> List[ScrapeResult]:
-        """Scrape each configured location page in sequence."""
+    def __init__(self, executor: Optional[Executor] = None, parse_pool: Optional[Executor] = None) -> None:
+        self.executor = executor
+        # CPU-bound HTML parsing goes to ``parse_pool`` (a process pool) when set,
+        # so it does not hold the GIL while other fetch threads are busy.
+        self.parse_pool = parse_pool
+
+    def scrape_all(self, force_refresh: bool = False, run_started_iso: Optional[str] = None) -> List[ScrapeResult]:
+        """Scrape each configured location page, concurrently when an executor is set."""
+
+        now = run_started_iso or datetime.now(timezone.utc).isoformat()
+        scrape_location = partial(self._scrape_location, force_refresh=force_refresh, run_started_iso=now)
+        return _map(self.executor, scrape_location, config.LOCATIONS)
+
+    def _scrape_location(
+        self, loc: config.Location, force_refresh: bool = False, run_started_iso: Optional[str] = None
+    ) -> ScrapeResult:
+        logger.info("Scraping Wikipedia for %s", loc.key)
+        return self.scrape(loc.wikipedia_url, force_refresh, run_started_iso)
+
+    def scrape(self, url: str, force_refresh: bool = False, run_started_iso: Optional[str] = None) -> ScrapeResult:
+        """Resolve a Wikipedia page into structured content.
+
+        The REST summary API is tried first; if it does not answer with a usable
+        payload, the full page is downloaded and parsed as before.
+        """
+
+        now = run_started_iso or datetime.now(timezone.utc).isoformat()
+        result = self._scrape_summary_api(url, now, force_refresh)
+        if result is not None:
+            return result
+        return self._scrape_html(url, now, force_refresh)
+
+    def _scrape_summary_api(self, url: str, now: str, force_refresh: bool = False) -> Optional[ScrapeResult]:
+        """Read title + extract from the REST summary endpoint, or ``None`` on failure."""
 
-        results: List[ScrapeResult] = []
-        for loc in config.LOCATIONS:
-            logger.info("Scraping Wikipedia for %s", loc.key)
-            results.append(self.scrape(loc.wikipedia_url))
-        return results
+        parts = urlsplit(url)
+        title = parts.path.rstrip("/").rsplit("/", 1)[-1]
+        if not title:
+            return None
+        api_url = SUMMARY_API_URL.format(host=parts.netloc, title=title)
+        resp, error, _ = _do_request(api_url, {}, force_refresh)
+        if error or not resp or not resp.ok:
+            logger.debug("Summary API unavailable for %s (%s), falling back to HTML", url, error or resp)
+            return None
+        try:
+            payload = _parse_json(resp)
+            parsed = {"title": payload["title"], "summary": payload["extract"]}
+        except (ValueError, KeyError, TypeError):
+            logger.debug("Unexpected summary payload for %s, falling back to HTML", url)
+            return None
+        logger.debug("Fetched Wikipedia summary title=%s", parsed["title"])
+        return ScrapeResult(url=url, ok=True, error=None, html=None, parsed=parsed, fetched_at_utc=now)
 
-    def scrape(self, url: str) -> ScrapeResult:
+    def _scrape_html(self, url: str, now: str, force_refresh: bool = False) -> ScrapeResult:
         """Download and parse a single Wikipedia page into structured content."""
 
-        now = datetime.now(timezone.utc).isoformat()
-        resp, error, duration_ms = _do_request(url, {})  # duration used in RawFetch; here unused
+        resp, error, duration_ms = _do_request(url, {}, force_refresh)  # duration used in RawFetch; here unused
         html = resp.text if resp and resp.ok else None
         parsed = None
         err = error or (None if resp and resp.ok else (resp.text if resp else None))
         if html:
+            digest = hashlib.sha1(resp.content).hexdigest()
+            cached_digest, cached_parsed = _PARSE_CACHE.get(url, ("", None))
+            if cached_digest == digest:
+                parsed = cached_parsed
+                logger.debug("Wikipedia page unchanged, reusing parse for %s", url)
+        if html and parsed is None:
             try:
-                soup = BeautifulSoup(html, "html.parser")
-                title = soup.find("h1").get_text(strip=True) if soup.find("h1") else ""
-                para = soup.find("p")
-                summary = para.get_text(strip=True) if para else ""
-                parsed = {"title": title, "summary": summary}
-                logger.debug("Parsed Wikipedia page title=%s", title)
+                if self.parse_pool is not None:
+                    parsed = self.parse_pool.submit(_parse_wiki_html, html).result()
+                else:
+                    parsed = _parse_wiki_html(html)
+                _PARSE_CACHE[url] = (digest, parsed)
+                logger.debug("Parsed Wikipedia page title=%s", parsed["title"])
             except Exception as exc:  # noqa: BLE001
                 err = str(exc)
                 logger.exception("Failed to parse Wikipedia page %s", url)
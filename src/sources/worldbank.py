@@ -1,46 +1,119 @@
 """World Bank macro-economic data source."""
 
 from datetime import datetime, timezone
-from typing import List
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
 import logging
 
 from src.config import config
-from src.sources.base import DataSource, RawFetchResult, _do_request
+from src.sources.base import DataSource, RawFetchResult, _do_request, _map, _parse_json
 
 logger = logging.getLogger(__name__)
 
+# The "sources" API returns several series for several countries in a single
+# response, unlike the per-indicator endpoint which needs one request each.
+BULK_URL = "https://api.worldbank.org/v2/sources/2/country/{countries}/series/{series}/data"
+
+# url -> (ETag or Last-Modified validator, bucketed rows). A response carrying
+# the same validator (typically a 304 revalidation) is not parsed again.
+_BUCKET_CACHE: Dict[str, Tuple[str, Dict[str, List[Dict[str, Any]]]]] = {}
+
 
 class WorldBankSource(DataSource):
     """Download annual macro indicators for the configured regions."""
 
     name = "worldbank"
 
-    def fetch(self) -> List[RawFetchResult]:
-        """Collect the configured World Bank indicators in one pass."""
-
-        results: List[RawFetchResult] = []
-        for indicator in config.WB_INDICATORS.keys():
-            logger.info("Fetching World Bank indicator %s", indicator)
-            results.append(self._fetch_indicator(indicator))
-        return results
-
-    def _fetch_indicator(self, indicator: str) -> RawFetchResult:
-        """Fetch a single indicator for all supported regions."""
-
-        now = datetime.now(timezone.utc).isoformat()
-        url = f"https://api.worldbank.org/v2/country/NLD;EUU;USA;WLD/indicator/{indicator}"
-        params = {"format": "json", "per_page": 5000}
-        resp, error, duration_ms = _do_request(url, params)
-        payload_json = resp.json() if resp and resp.ok else None
-        return RawFetchResult(
-            source=f"{self.name}-{indicator}",
-            url=url,
-            params=params,
-            status_code=resp.status_code if resp else None,
-            ok=bool(resp and resp.ok),
-            error=error or (None if resp and resp.ok else (resp.text if resp else None)),
-            duration_ms=duration_ms,
-            payload_json=payload_json,
-            payload_text=resp.text if resp else None,
-            fetched_at_utc=now,
-        )
+    def fetch(self, force_refresh: bool = False, run_started_iso: Optional[str] = None) -> List[RawFetchResult]:
+        """Collect every configured indicator with one bulk request.
+
+        One ``RawFetchResult`` is still emitted per indicator so downstream
+        logging and ``transform_macro`` keep their per-indicator view. Each
+        payload is rebuilt in the classic ``[meta, rows]`` indicator shape.
+        Should the response ever span several pages, the remaining pages are
+        fetched concurrently over the shared session.
+        """
+
+        now = run_started_iso or datetime.now(timezone.utc).isoformat()
+        indicators = list(config.WB_INDICATORS.keys())
+        url = BULK_URL.format(countries=config.WB_COUNTRIES_PATH, series=config.WB_SERIES_PATH)
+        params = {"format": "json", "per_page": 20000}
+        logger.info("Fetching World Bank indicators %s", ", ".join(indicators))
+        resp, error, duration_ms = _do_request(url, params, force_refresh)
+        ok = bool(resp and resp.ok)
+        buckets: Dict[str, List[Dict[str, Any]]] = {}
+        validator = (resp.headers.get("ETag") or resp.headers.get("Last-Modified")) if ok else None
+        cached = _BUCKET_CACHE.get(url)
+        if validator and cached and cached[0] == validator:
+            logger.debug("World Bank bulk payload unchanged (%s); reusing parsed rows", validator)
+            buckets = cached[1]
+        elif ok:
+            payload = _parse_json(resp)
+            rows = self._rows(payload)
+            pages = int(payload.get("pages") or 1) if isinstance(payload, dict) else 1
+            if pages > 1:
+                fetch_page = partial(self._fetch_page, url, params, force_refresh=force_refresh)
+                for page_rows in _map(self.executor, fetch_page, range(2, pages + 1)):
+                    rows.extend(page_rows)
+            buckets = self._bucket_by_indicator(rows)
+            if validator and pages == 1:
+                _BUCKET_CACHE[url] = (validator, buckets)
+        return [
+            RawFetchResult(
+                source=f"{self.name}-{indicator}",
+                url=url,
+                params=params,
+                status_code=resp.status_code if resp else None,
+                ok=ok,
+                error=error or (None if ok else (resp.text if resp else None)),
+                duration_ms=duration_ms,
+                payload_json=[{"indicator": indicator}, buckets.get(indicator, [])] if ok else None,
+                payload_text=None if ok else (resp.text if resp else None),
+                fetched_at_utc=now,
+                subtype=indicator,
+            )
+            for indicator in indicators
+        ]
+
+    def _fetch_page(
+        self, url: str, params: Dict[str, Any], page: int, force_refresh: bool = False
+    ) -> List[Dict[str, Any]]:
+        resp, error, _ = _do_request(url, {**params, "page": page}, force_refresh)
+        if not (resp and resp.ok):
+            logger.warning("World Bank page %s failed: %s", page, error or (resp.text if resp else None))
+            return []
+        return self._rows(_parse_json(resp))
+
+    @staticmethod
+    def _rows(payload: Any) -> List[Dict[str, Any]]:
+        """Return the data rows of one bulk response page."""
+
+        if not isinstance(payload, dict):
+            return []
+        source = payload.get("source") or {}
+        if isinstance(source, list):
+            source = source[0] if source else {}
+        return list(source.get("data") or [])
+
+    @staticmethod
+    def _bucket_by_indicator(rows: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Group bulk rows by series into ``countryiso3code``/``date``/``value`` dicts.
+
+        Bulk rows describe their dimensions as a ``variable`` list of
+        ``{"concept", "id", "value"}`` entries (Country, Series, Time).
+        """
+
+        buckets: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            dims = {var.get("concept"): var for var in row.get("variable", [])}
+            series = dims.get("Series", {}).get("id")
+            if not series:
+                continue
+            buckets.setdefault(series, []).append(
+                {
+                    "countryiso3code": dims.get("Country", {}).get("id"),
+                    "date": dims.get("Time", {}).get("value"),
+                    "value": row.get("value"),
+                }
+            )
+        return buckets
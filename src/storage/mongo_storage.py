@@ -1,15 +1,30 @@
 """Lightweight wrapper for optional MongoDB logging."""
 
-from typing import Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import atexit
+import hashlib
 import logging
+import queue
+import threading
+import time
+import zlib
+import orjson
+from bson import Binary
 from pymongo import MongoClient
 from pymongo.collection import Collection
-from pymongo.errors import PyMongoError
+from pymongo.errors import BulkWriteError, PyMongoError
 from src.config import config
 from src.sources.base import RawFetchResult, ScrapeResult
 
 logger = logging.getLogger(__name__)
 
+# How long a reachability probe result is trusted before pinging again.
+PROBE_INTERVAL_S = 30.0
+# Raw bodies at least this long are stored zlib-compressed (``*_zlib`` fields).
+COMPRESS_MIN_CHARS = 4096
+# Pending results beyond this are dropped, oldest first.
+QUEUE_MAX = 10_000
+
 
 class MongoStorage:
     """Log raw fetches and scrapes for later inspection.
@@ -18,37 +33,81 @@ class MongoStorage:
     attempting to persist diagnostics. This keeps the rest of the application
     decoupled from Mongo while still enabling deep debugging when it is running
     (e.g., via Docker Compose).
+
+    Logging never blocks the caller: results go onto a bounded queue and a
+    daemon thread turns them into documents and writes whatever has queued up
+    with ``insert_many`` (at most ``batch_size`` per call). ``flush()`` waits
+    for the queue to drain and is registered to run at interpreter exit.
+
+    Raw bodies are stored as ``payload_text``/``html`` when short and as
+    zlib-compressed ``payload_text_zlib``/``html_zlib`` binaries otherwise.
+    ``payload_text`` is dropped whenever the parsed ``payload_json`` exists.
+    Parsed payloads are content-addressed: each distinct one is stored once in
+    ``payload_blobs`` (``_id`` = SHA-256 of its canonical JSON) and fetch docs
+    reference it via ``payload_sha256``/``payload_bytes``.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, batch_size: int = 100) -> None:
         self.client: Optional[MongoClient] = None
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[Tuple[str, Any]]" = queue.Queue(maxsize=QUEUE_MAX)
+        self._probed_at: Optional[float] = None
+        self._reachable = False
+        # Digests already stored in ``payload_blobs`` (only touched by the worker).
+        self._known_blobs: Set[str] = set()
         self._connect()
+        if self.client:
+            threading.Thread(target=self._worker, name="mongo-log", daemon=True).start()
+            atexit.register(self.flush, timeout=5.0)
 
     def _connect(self) -> None:
+        # MongoClient connects lazily, so construction never blocks startup;
+        # reachability is checked on demand by ``available``.
         try:
-            self.client = MongoClient(config.MONGO_URI, serverSelectionTimeoutMS=2000)
-            self.client.server_info()
-            logger.info("Connected to MongoDB at %s", config.MONGO_URI)
+            self.client = MongoClient(config.MONGO_URI, serverSelectionTimeoutMS=200, connectTimeoutMS=200)
         except PyMongoError as exc:  # noqa: BLE001
             logger.warning("MongoDB unavailable: %s", exc)
             self.client = None
 
     @property
     def available(self) -> bool:
-        """Expose whether MongoDB is reachable (useful for UI status displays)."""
+        """Expose whether MongoDB is reachable (useful for UI status displays).
 
-        return self.client is not None
+        The ping result is cached for ``PROBE_INTERVAL_S`` seconds.
+        """
+
+        if not self.client:
+            return False
+        now = time.monotonic()
+        if self._probed_at is None or now - self._probed_at >= PROBE_INTERVAL_S:
+            try:
+                self.client.admin.command("ping")
+                reachable = True
+            except PyMongoError as exc:  # noqa: BLE001
+                reachable = False
+                if self._probed_at is None or self._reachable:
+                    logger.warning("MongoDB unavailable: %s", exc)
+            if reachable and not self._reachable:
+                logger.info("Connected to MongoDB at %s", config.MONGO_URI)
+            self._reachable = reachable
+            self._probed_at = now
+        return self._reachable
 
     def _col(self, name: str) -> Collection:
         assert self.client
         return self.client[config.DB_NAME][name]
 
-    def log_fetch(self, result: RawFetchResult) -> None:
-        """Persist an API request/response to MongoDB for debugging."""
+    @staticmethod
+    def _body_fields(name: str, text: Optional[str]) -> Dict[str, Any]:
+        if text is not None and len(text) >= COMPRESS_MIN_CHARS:
+            return {name: None, f"{name}_zlib": Binary(zlib.compress(text.encode("utf-8"), 1))}
+        return {name: text}
 
-        if not self.client:
-            return
-        doc = {
+    @classmethod
+    def _fetch_doc(cls, result: RawFetchResult) -> Dict[str, Any]:
+        # The parsed JSON already carries everything the raw body would.
+        payload_text = result.payload_text if result.payload_json is None else None
+        return {
             "source": result.source,
             "url": result.url,
             "params": result.params,
@@ -57,22 +116,142 @@ class MongoStorage:
             "error": result.error,
             "duration_ms": result.duration_ms,
             "payload_json": result.payload_json,
-            "payload_text": result.payload_text,
+            **cls._body_fields("payload_text", payload_text),
             "fetched_at_utc": result.fetched_at_utc,
         }
-        self._col("raw_fetches").insert_one(doc)
-
-    def log_scrape(self, result: ScrapeResult) -> None:
-        """Persist a scraped HTML page and parsed metadata for auditing."""
 
-        if not self.client:
-            return
-        doc = {
+    @classmethod
+    def _scrape_doc(cls, result: ScrapeResult) -> Dict[str, Any]:
+        return {
             "url": result.url,
             "ok": result.ok,
             "error": result.error,
-            "html": result.html,
+            **cls._body_fields("html", result.html),
             "parsed": result.parsed,
             "fetched_at_utc": result.fetched_at_utc,
         }
-        self._col("scraped_pages").insert_one(doc)
+
+    def _enqueue(self, collection: str, results: Iterable[Any]) -> None:
+        for result in results:
+            try:
+                self._queue.put_nowait((collection, result))
+            except queue.Full:
+                logger.warning("Mongo log queue full; dropping the oldest entry")
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                except queue.Empty:
+                    pass
+                try:
+                    self._queue.put_nowait((collection, result))
+                except queue.Full:
+                    pass
+
+    def _worker(self) -> None:
+        builders: Dict[str, Callable[[Any], Dict[str, Any]]] = {
+            "raw_fetches": self._fetch_doc,
+            "scraped_pages": self._scrape_doc,
+        }
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                docs: Dict[str, List[Dict[str, Any]]] = {}
+                for collection, result in batch:
+                    docs.setdefault(collection, []).append(builders[collection](result))
+                blobs = {}
+                for doc in docs.get("raw_fetches", ()):
+                    blob = self._externalize_payload(doc)
+                    if blob:
+                        blobs.setdefault(blob["_id"], blob)
+                self._insert_blobs(list(blobs.values()))
+                for collection, collection_docs in docs.items():
+                    self._insert(collection, collection_docs)
+            except Exception:  # noqa: BLE001
+                logger.exception("Failed to write Mongo log batch")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _externalize_payload(self, doc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Swap ``payload_json`` for its digest; return a blob doc unless it is known stored."""
+
+        payload = doc.pop("payload_json", None)
+        if payload is None:
+            doc["payload_sha256"] = None
+            return None
+        body = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        digest = hashlib.sha256(body).hexdigest()
+        doc["payload_sha256"] = digest
+        doc["payload_bytes"] = len(body)
+        if digest in self._known_blobs:
+            return None
+        return {"_id": digest, "payload_json": payload}
+
+    def _insert_blobs(self, blobs: List[Dict[str, Any]]) -> None:
+        """Store new payload blobs; only digests confirmed stored become known."""
+
+        if not blobs or not self.client:
+            return
+        try:
+            self._col("payload_blobs").insert_many(blobs, ordered=False, bypass_document_validation=True)
+        except BulkWriteError as exc:
+            # Blobs stored by an earlier process are expected duplicates; any
+            # other failure leaves the digest unknown so a later batch retries it.
+            failed = {
+                error.get("index")
+                for error in exc.details.get("writeErrors", [])
+                if error.get("code") != 11000
+            }
+            if failed:
+                logger.warning("MongoDB blob write failed: %s", exc)
+            self._known_blobs.update(blob["_id"] for i, blob in enumerate(blobs) if i not in failed)
+        except PyMongoError as exc:  # noqa: BLE001
+            logger.warning("MongoDB write failed, disabling logging: %s", exc)
+            self.client = None
+        else:
+            self._known_blobs.update(blob["_id"] for blob in blobs)
+
+    def _insert(self, collection: str, docs: List[Dict[str, Any]]) -> None:
+        if not docs or not self.client:
+            return
+        try:
+            self._col(collection).insert_many(docs, ordered=False, bypass_document_validation=True)
+        except PyMongoError as exc:  # noqa: BLE001
+            # Diagnostics are best-effort: stop trying once Mongo goes away.
+            logger.warning("MongoDB write failed, disabling logging: %s", exc)
+            self.client = None
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued result is written; ``False`` on timeout."""
+
+        with self._queue.all_tasks_done:
+            return self._queue.all_tasks_done.wait_for(lambda: not self._queue.unfinished_tasks, timeout)
+
+    def log_fetch(self, result: RawFetchResult) -> None:
+        """Persist an API request/response to MongoDB for debugging."""
+
+        self.log_fetch_many([result])
+
+    def log_fetch_many(self, results: Iterable[RawFetchResult]) -> None:
+        """Queue a batch of API responses for the background writer."""
+
+        if not self.client:
+            return
+        self._enqueue("raw_fetches", results)
+
+    def log_scrape(self, result: ScrapeResult) -> None:
+        """Persist a scraped HTML page and parsed metadata for auditing."""
+
+        self.log_scrape_many([result])
+
+    def log_scrape_many(self, results: Iterable[ScrapeResult]) -> None:
+        """Queue a batch of scrapes for the background writer."""
+
+        if not self.client:
+            return
+        self._enqueue("scraped_pages", results)
@@ -1,23 +1,154 @@
 """SQLite persistence layer for curated EcoPulse data."""
 
+import queue
 import sqlite3
-from contextlib import closing
-from typing import Iterable, List, Optional, Tuple
+import threading
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 import logging
 
 from src.config import config
 
 logger = logging.getLogger(__name__)
 
+# Per-connection settings: the larger page cache/mmap keep the hot fact tables
+# in memory, and busy_timeout waits for a competing writer instead of failing.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA busy_timeout=30000;",
+    "PRAGMA cache_size=-262144;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA mmap_size=268435456;",
+)
+# Writer-only settings. WAL makes synchronous=NORMAL crash-safe (a power loss
+# can only drop the latest commits) and lets readers run alongside the writer.
+# Tables whose planner statistics are gathered as soon as they first hold rows.
+_STAT_TABLES = ("fact_env_hourly", "fact_macro_annual")
+
+_WRITER_PRAGMAS = (
+    "PRAGMA journal_mode=WAL;",
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA wal_autocheckpoint=1000;",
+)
+
 
 class SQLiteStorage:
-    """Encapsulates schema management and upserts for the SQLite database."""
+    """Encapsulates schema management and upserts for the SQLite database.
+
+    ``conn`` is the single writer connection, serialized by a lock. Queries go
+    through a small pool of read-only connections so dashboard reads do not
+    queue behind ingest writes (WAL lets them run concurrently).
 
-    def __init__(self) -> None:
-        self.conn = sqlite3.connect(config.SQLITE_FILE, check_same_thread=False)
-        self.conn.execute("PRAGMA journal_mode=WAL;")
+    The writer runs in autocommit mode with explicit transactions: each write
+    method commits on its own unless called inside ``transaction()`` (or
+    ``begin()``/``commit()``), which groups a whole transform into one commit.
+    Bulk writers stream their ``rows`` iterable straight into ``executemany``,
+    so generators are never materialized.
+    """
+
+    def __init__(self, readers: int = 4) -> None:
+        self.conn = self._open(config.SQLITE_FILE)
+        self.conn.isolation_level = None
+        for pragma in _WRITER_PRAGMAS:
+            self.conn.execute(pragma)
+        # Re-entrant so write methods can run inside a caller's transaction.
+        self._write_lock = threading.RLock()
+        # fetch_run_log rows waiting for the next commit (see ``log_run``).
+        self._pending_runs: List[Tuple[str, Optional[str], int, str]] = []
+        # Stat tables with no sqlite_stat1 rows yet, and those to ANALYZE at the next commit.
+        self._unanalyzed: Set[str] = set()
+        self._analyze_on_commit: Set[str] = set()
         logger.info("Opened SQLite database at %s", config.SQLITE_FILE)
         self._init_schema()
+        read_uri = f"{Path(config.SQLITE_FILE).absolute().as_uri()}?mode=ro"
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(readers):
+            self._readers.put(self._open(read_uri, uri=True))
+
+    @staticmethod
+    def _open(database: str, uri: bool = False) -> sqlite3.Connection:
+        conn = sqlite3.connect(database, check_same_thread=False, uri=uri)
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def _with_reader(self) -> Iterator[sqlite3.Cursor]:
+        """Check out a read-only connection and yield a cursor on it."""
+
+        conn = self._readers.get()
+        try:
+            with closing(conn.cursor()) as cur:
+                yield cur
+        finally:
+            self._readers.put(conn)
+
+    def begin(self) -> None:
+        """Open a ``BEGIN IMMEDIATE`` transaction on the writer.
+
+        Taking the write lock up front avoids the SQLITE_BUSY a deferred
+        transaction hits when it upgrades from reading to writing. The writer
+        lock is held until ``commit()`` or ``rollback()``.
+        """
+
+        self._write_lock.acquire()
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self._write_lock.release()
+            raise
+
+    def commit(self) -> None:
+        """Commit the open transaction, writing any buffered run-log rows first."""
+
+        try:
+            if self._pending_runs:
+                self.conn.executemany(
+                    "INSERT INTO fetch_run_log(started_at_utc, finished_at_utc, ok, message) VALUES (?, ?, ?, ?)",
+                    self._pending_runs,
+                )
+            for table in self._analyze_on_commit:
+                self.conn.execute(f"ANALYZE {table}")
+            self.conn.execute("COMMIT")
+            self._pending_runs.clear()
+            self._unanalyzed -= self._analyze_on_commit
+        except BaseException:
+            if self.conn.in_transaction:
+                self.conn.execute("ROLLBACK")
+            raise
+        finally:
+            self._analyze_on_commit.clear()
+            self._write_lock.release()
+
+    def rollback(self) -> None:
+        try:
+            self.conn.execute("ROLLBACK")
+        finally:
+            self._analyze_on_commit.clear()
+            self._write_lock.release()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group every write in the block into a single commit."""
+
+        self.begin()
+        try:
+            yield
+        except BaseException:
+            self.rollback()
+            raise
+        self.commit()
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Yield the writer, in a transaction of its own unless one is open."""
+
+        with self._write_lock:
+            if self.conn.in_transaction:
+                yield self.conn
+                return
+            with self.transaction():
+                yield self.conn
 
     def _init_schema(self) -> None:
         with closing(self.conn.cursor()) as cur:
@@ -80,44 +211,149 @@ class SQLiteStorage:
                     message TEXT,
                     item_count INTEGER
                 );
+                CREATE TABLE IF NOT EXISTS wiki_parse_cache(
+                    url TEXT PRIMARY KEY,
+                    content_sha1 TEXT NOT NULL,
+                    title TEXT,
+                    summary TEXT
+                );
+                -- Covering index for the indicator-driven macro queries; the
+                -- primary key leads with region_code and cannot serve them.
+                -- (fact_env_hourly's primary key already matches the
+                -- location_key + ts_utc DESC lookups, scanned backwards.)
+                CREATE INDEX IF NOT EXISTS idx_macro_ind_year
+                    ON fact_macro_annual(indicator_code, year DESC, region_code, value);
                 """
             )
             self.conn.commit()
         self._seed_dimensions()
+        self._analyze()
 
-    def _seed_dimensions(self) -> None:
-        """Ensure core dimension tables contain the configured metadata."""
+    def _analyze(self) -> None:
+        """Find stat tables without planner statistics and analyze those already holding rows.
+
+        Empty tables are analyzed by the first commit that writes to them
+        (see ``_note_rows_written``); ``close()`` runs ``PRAGMA optimize``.
+        """
 
         with closing(self.conn.cursor()) as cur:
-            cur.executemany(
+            analyzed: Set[str] = set()
+            if cur.execute("SELECT 1 FROM sqlite_master WHERE name='sqlite_stat1'").fetchone():
+                analyzed = {row[0] for row in cur.execute("SELECT DISTINCT tbl FROM sqlite_stat1")}
+            for table in _STAT_TABLES:
+                if table in analyzed:
+                    continue
+                if cur.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone():
+                    cur.execute(f"ANALYZE {table}")
+                else:
+                    self._unanalyzed.add(table)
+
+    def _note_rows_written(self, table: str, cursor: sqlite3.Cursor) -> None:
+        """Schedule ANALYZE of ``table`` at commit if this write gave it its first rows."""
+
+        if table in self._unanalyzed and cursor.rowcount > 0:
+            self._analyze_on_commit.add(table)
+
+    def _seed_dimensions(self) -> None:
+        """Ensure core dimension tables contain the configured metadata.
+
+        Rows are only ever inserted (``INSERT OR IGNORE``), so when every
+        configured key is already present the warm start skips writing.
+        """
+
+        if self._dimensions_seeded():
+            return
+        with self._write() as conn:
+            conn.executemany(
                 "INSERT OR IGNORE INTO dim_region(region_code, region_name) VALUES (?, ?)",
                 [(code, name) for code, name in config.WB_REGIONS.items()],
             )
-            cur.executemany(
+            conn.executemany(
                 "INSERT OR IGNORE INTO dim_indicator(indicator_code, indicator_name, unit, source) VALUES (?, ?, ?, ?)",
                 [
                     (code, name, None, "World Bank")
                     for code, name in config.WB_INDICATORS.items()
                 ],
             )
-            cur.executemany(
+            conn.executemany(
                 "INSERT OR IGNORE INTO dim_location(location_key, name, lat, lon, wikipedia_url) VALUES (?, ?, ?, ?, ?)",
                 [
                     (loc.key, loc.name, loc.lat, loc.lon, loc.wikipedia_url)
                     for loc in config.LOCATIONS
                 ],
             )
-            self.conn.commit()
+
+    def _dimensions_seeded(self) -> bool:
+        probes = (
+            ("SELECT region_code FROM dim_region", config.WB_REGIONS),
+            ("SELECT indicator_code FROM dim_indicator", config.WB_INDICATORS),
+            ("SELECT location_key FROM dim_location", {loc.key for loc in config.LOCATIONS}),
+        )
+        for query, expected in probes:
+            present = {key for (key,) in self.conn.execute(query)}
+            if not present.issuperset(expected):
+                return False
+        return True
 
     def update_location_wiki(self, location_key: str, title: Optional[str], summary: Optional[str]) -> None:
         """Store parsed Wikipedia metadata for a location."""
 
-        with closing(self.conn.cursor()) as cur:
-            cur.execute(
+        with self._write() as conn:
+            conn.execute(
                 "UPDATE dim_location SET wiki_title=?, wiki_summary=? WHERE location_key=?",
                 (title, summary, location_key),
             )
-            self.conn.commit()
+
+    def location_keys_by_wiki_url(self) -> Dict[str, List[str]]:
+        """Map each Wikipedia URL to the location keys that reference it."""
+
+        keys_by_url: Dict[str, List[str]] = {}
+        with self._with_reader() as cur:
+            cur.execute("SELECT wikipedia_url, location_key FROM dim_location WHERE wikipedia_url IS NOT NULL")
+            for url, location_key in cur.fetchall():
+                keys_by_url.setdefault(url, []).append(location_key)
+        return keys_by_url
+
+    def update_locations_wiki(self, rows: Iterable[Tuple[Optional[str], Optional[str], str]]) -> None:
+        """Store parsed Wikipedia metadata for many locations in one transaction.
+
+        Rows are ``(title, summary, location_key)`` tuples.
+        """
+
+        with self._write() as conn:
+            conn.executemany(
+                "UPDATE dim_location SET wiki_title=?, wiki_summary=? WHERE location_key=?",
+                rows,
+            )
+
+    def load_wiki_parse_cache(self) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """Read persisted Wikipedia parse results keyed by page URL."""
+
+        with self._with_reader() as cur:
+            cur.execute("SELECT url, content_sha1, title, summary FROM wiki_parse_cache")
+            return {
+                url: (digest, {"title": title, "summary": summary})
+                for url, digest, title, summary in cur.fetchall()
+            }
+
+    def save_wiki_parse_cache(self, entries: Dict[str, Tuple[str, Dict[str, Any]]]) -> None:
+        """Persist Wikipedia parse results so restarts keep skipping unchanged pages."""
+
+        with self._write() as conn:
+            conn.executemany(
+                """
+                INSERT INTO wiki_parse_cache(url, content_sha1, title, summary)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    content_sha1=excluded.content_sha1,
+                    title=excluded.title,
+                    summary=excluded.summary;
+                """,
+                [
+                    (url, digest, parsed.get("title"), parsed.get("summary"))
+                    for url, (digest, parsed) in entries.items()
+                ],
+            )
 
     def upsert_env_hourly(
         self,
@@ -135,10 +371,14 @@ class SQLiteStorage:
             ]
         ],
     ) -> None:
-        """Insert or update hourly environment facts in bulk."""
+        """Insert or update hourly environment facts in bulk.
 
-        with closing(self.conn.cursor()) as cur:
-            cur.executemany(
+        Rows whose values are unchanged are left untouched, so re-ingesting
+        the overlapping forecast window does not rewrite pages.
+        """
+
+        with self._write() as conn:
+            cur = conn.executemany(
                 """
                 INSERT INTO fact_env_hourly(location_key, ts_utc, temp_c, wind_kph, precip_mm, pm2_5, pm10, european_aqi, us_aqi)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
@@ -149,36 +389,48 @@ class SQLiteStorage:
                     pm2_5=excluded.pm2_5,
                     pm10=excluded.pm10,
                     european_aqi=excluded.european_aqi,
-                    us_aqi=excluded.us_aqi;
+                    us_aqi=excluded.us_aqi
+                WHERE (temp_c, wind_kph, precip_mm, pm2_5, pm10, european_aqi, us_aqi)
+                    IS NOT (excluded.temp_c, excluded.wind_kph, excluded.precip_mm, excluded.pm2_5,
+                            excluded.pm10, excluded.european_aqi, excluded.us_aqi);
                 """,
-                list(rows),
+                rows,
             )
-            self.conn.commit()
+            self._note_rows_written("fact_env_hourly", cur)
 
     def upsert_macro(self, rows: Iterable[Tuple[str, str, int, Optional[float]]]) -> None:
         """Insert or update macro facts."""
 
-        with closing(self.conn.cursor()) as cur:
-            cur.executemany(
+        with self._write() as conn:
+            cur = conn.executemany(
                 """
                 INSERT INTO fact_macro_annual(region_code, indicator_code, year, value)
                 VALUES (?, ?, ?, ?)
                 ON CONFLICT(region_code, indicator_code, year) DO UPDATE SET
-                    value=excluded.value;
+                    value=excluded.value
+                WHERE value IS NOT excluded.value;
                 """,
-                list(rows),
+                rows,
             )
-            self.conn.commit()
+            self._note_rows_written("fact_macro_annual", cur)
 
     def log_run(self, started: str, finished: Optional[str], ok: bool, message: str) -> None:
-        """Record a top-level fetch session."""
+        """Record a top-level fetch session.
 
-        with closing(self.conn.cursor()) as cur:
-            cur.execute(
-                "INSERT INTO fetch_run_log(started_at_utc, finished_at_utc, ok, message) VALUES (?, ?, ?, ?)",
-                (started, finished, int(ok), message),
-            )
-            self.conn.commit()
+        The row rides along with the next write transaction instead of paying
+        for a commit of its own; ``flush_run_log()`` and ``close()`` force it.
+        """
+
+        with self._write_lock:
+            self._pending_runs.append((started, finished, int(ok), message))
+
+    def flush_run_log(self) -> None:
+        """Write buffered ``log_run`` rows now."""
+
+        with self._write_lock:
+            if self._pending_runs:
+                with self._write():
+                    pass
 
     def log_source_run(
         self,
@@ -191,20 +443,19 @@ class SQLiteStorage:
     ) -> None:
         """Record the outcome of a single data source execution."""
 
-        with closing(self.conn.cursor()) as cur:
-            cur.execute(
+        with self._write() as conn:
+            conn.execute(
                 """
                 INSERT INTO fetch_source_log(source_name, started_at_utc, finished_at_utc, ok, message, item_count)
                 VALUES (?, ?, ?, ?, ?, ?)
                 """,
                 (source_name, started, finished, int(ok), message, item_count),
             )
-            self.conn.commit()
 
     def latest_source_runs(self, limit: int = 50):
         """Fetch recent source executions for display in the UI."""
 
-        with closing(self.conn.cursor()) as cur:
+        with self._with_reader() as cur:
             cur.execute(
                 """
                 SELECT source_name, started_at_utc, finished_at_utc, ok, message, item_count
@@ -217,24 +468,68 @@ class SQLiteStorage:
             return cur.fetchall()
 
     def latest_env_rows(self, location_key: str, limit: int = 48) -> List[Tuple]:
-        with closing(self.conn.cursor()) as cur:
-            cur.execute(
+        return list(self.iter_latest_env_rows(location_key, limit))
+
+    def iter_latest_env_rows(self, location_key: str, limit: int = 48) -> Iterator[Tuple]:
+        """Yield ``latest_env_rows`` straight off the cursor.
+
+        The reader connection stays checked out until the generator is
+        exhausted or closed.
+        """
+
+        with self._with_reader() as cur:
+            yield from cur.execute(
                 "SELECT ts_utc, temp_c, wind_kph, precip_mm, pm2_5, pm10, european_aqi, us_aqi FROM fact_env_hourly WHERE location_key=? ORDER BY ts_utc DESC LIMIT ?",
                 (location_key, limit),
             )
-            return cur.fetchall()
+
+    def latest_env_snapshot(self, location_key: str, limit: int = 48) -> Tuple[List[Tuple], Optional[Tuple]]:
+        """Return ``(latest_env_rows, latest_env_kpis)`` from a single query.
+
+        The KPI row is the newest hourly row, i.e. the first of ``rows``.
+        """
+
+        rows = self.latest_env_rows(location_key, limit)
+        return rows, rows[0] if rows else None
 
     def latest_env_kpis(self, location_key: str) -> Optional[Tuple]:
-        with closing(self.conn.cursor()) as cur:
+        with self._with_reader() as cur:
             cur.execute(
                 "SELECT ts_utc, temp_c, wind_kph, precip_mm, pm2_5, pm10, european_aqi, us_aqi FROM fact_env_hourly WHERE location_key=? ORDER BY ts_utc DESC LIMIT 1",
                 (location_key,),
             )
             return cur.fetchone()
 
-    def macro_series(self, indicator: str, start_year: int, end_year: int) -> List[Tuple]:
-        with closing(self.conn.cursor()) as cur:
+    def latest_env_kpis_all(self) -> Dict[str, Tuple]:
+        """Return the latest ``latest_env_kpis`` row for every location at once.
+
+        Each location costs one primary-key seek (newest ``ts_utc``) inside a
+        single statement, rather than a window over the whole fact table.
+        """
+
+        with self._with_reader() as cur:
             cur.execute(
+                """
+                SELECT f.location_key, f.ts_utc, f.temp_c, f.wind_kph, f.precip_mm, f.pm2_5, f.pm10, f.european_aqi, f.us_aqi
+                FROM dim_location AS l
+                JOIN fact_env_hourly AS f ON f.rowid = (
+                    SELECT rowid FROM fact_env_hourly
+                    WHERE location_key = l.location_key
+                    ORDER BY ts_utc DESC
+                    LIMIT 1
+                )
+                """
+            )
+            return {row[0]: row[1:] for row in cur.fetchall()}
+
+    def macro_series(self, indicator: str, start_year: int, end_year: int) -> List[Tuple]:
+        return list(self.iter_macro_series(indicator, start_year, end_year))
+
+    def iter_macro_series(self, indicator: str, start_year: int, end_year: int) -> Iterator[Tuple]:
+        """Yield ``macro_series`` rows straight off the cursor."""
+
+        with self._with_reader() as cur:
+            yield from cur.execute(
                 """
                 SELECT region_code, year, value FROM fact_macro_annual
                 WHERE indicator_code=? AND year BETWEEN ? AND ?
@@ -242,10 +537,9 @@ class SQLiteStorage:
                 """,
                 (indicator, start_year, end_year),
             )
-            return cur.fetchall()
 
     def macro_latest(self, indicator: str) -> List[Tuple]:
-        with closing(self.conn.cursor()) as cur:
+        with self._with_reader() as cur:
             cur.execute(
                 """
                 SELECT region_code, year, value FROM fact_macro_annual
@@ -257,4 +551,8 @@ class SQLiteStorage:
             return cur.fetchall()
 
     def close(self) -> None:
+        self.flush_run_log()
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+        self.conn.execute("PRAGMA optimize;")
         self.conn.close()
@@ -4,12 +4,15 @@ import threading
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
 import csv
 import logging
 
 import matplotlib
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
 
 from src.app_service import AppService
 from src.config import config
@@ -18,6 +21,184 @@ matplotlib.use("TkAgg")
 
 logger = logging.getLogger(__name__)
 
+# Quiet period before a burst of widget changes triggers one refresh.
+REFRESH_DEBOUNCE_MS = 200
+# Worker-thread status messages are coalesced and applied at most this often.
+STATUS_FLUSH_MS = 50
+# Views invalidated by backend runs are refreshed together at most this often.
+REFRESH_DRAIN_MS = 500
+# Upper bound on labelled ticks along the env chart's time axis.
+ENV_MAX_XTICKS = 8
+# Combobox choices; config is loaded once at import.
+_LOC_KEYS = tuple(loc.key for loc in config.LOCATIONS)
+_WB_KEYS = tuple(config.WB_INDICATORS.keys())
+# Dashboard views to refresh after a source's run is committed.
+_SOURCE_VIEWS = {
+    "environment": ("env", "log"),
+    "macro": ("macro", "log"),
+    "wikipedia": ("log",),
+}
+
+
+class _BlitChart:
+    """Redraw a chart's lines with blitting while its axes layout is unchanged.
+
+    Lines are ``animated`` so full renders leave them out of the cached
+    background; every full render re-captures the background and blits the
+    lines on top. ``update`` falls back to a full (idle) render only when the
+    caller's layout key or the autoscaled limits change.
+    """
+
+    def __init__(self, canvas: FigureCanvasTkAgg, ax: Any) -> None:
+        self.canvas = canvas
+        self.ax = ax
+        self.lines: Dict[str, Line2D] = {}
+        self._background: Optional[Any] = None
+        self._layout: Optional[Hashable] = None
+        canvas.mpl_connect("draw_event", self._on_draw)
+        # The charts have no hover or pick interaction; don't route pointer
+        # motion through matplotlib's event machinery.
+        widget = canvas.get_tk_widget()
+        for sequence in ("<Motion>", "<Enter>", "<Leave>"):
+            widget.unbind(sequence)
+
+    def line(self, key: str, **kwargs: Any) -> Line2D:
+        """Return the line for ``key``, creating it on first use."""
+
+        line = self.lines.get(key)
+        if line is None:
+            (line,) = self.ax.plot([], [], animated=True, label=key, **kwargs)
+            self.lines[key] = line
+        return line
+
+    def update(self, layout_key: Hashable) -> None:
+        """Show lines updated via ``set_data``; ``layout_key`` covers titles/ticks."""
+
+        self.ax.relim()
+        self.ax.autoscale_view()
+        layout = (layout_key, tuple(self.ax.get_xlim()), tuple(self.ax.get_ylim()))
+        if layout != self._layout or self._background is None:
+            self._layout = layout
+            self.canvas.draw_idle()
+        else:
+            self._blit()
+
+    def _on_draw(self, _event: Any) -> None:
+        self._background = self.canvas.copy_from_bbox(self.ax.figure.bbox)
+        self._blit()
+
+    def _blit(self) -> None:
+        if self._background is None:
+            return
+        self.canvas.restore_region(self._background)
+        for line in self.lines.values():
+            self.ax.draw_artist(line)
+        self.canvas.blit(self.ax.figure.bbox)
+
+
+def _insert_rows(tree: ttk.Treeview, rows) -> None:
+    """Append ``rows`` to ``tree`` in a single Tcl call.
+
+    The rows cross into Tcl as one nested list and a Tcl ``foreach`` issues
+    the inserts, instead of one Python-to-Tcl round trip per row.
+    """
+    rows = tuple(map(tuple, rows))
+    if rows:
+        tree.tk.call("foreach", "values", rows, f"{tree} insert {{}} end -values $values")
+
+
+class _VirtualTree:
+    """Keep only the visible slice of ``rows`` materialized in a Treeview.
+
+    The scrollbar and mouse wheel move a window over the Python-side rows;
+    the widget holds one item per visible line, whose values are rewritten
+    in place, so refreshing or scrolling costs O(visible) Tk calls.
+    """
+
+    def __init__(self, tree: ttk.Treeview, scrollbar: ttk.Scrollbar) -> None:
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.rows: Sequence[Sequence[Any]] = []
+        self.offset = 0
+        # Rendered row height and y of the first row (below the headings),
+        # measured from the widget; None until a row has been laid out.
+        self._row_height: Optional[int] = None
+        self._rows_top = 0
+        scrollbar.configure(command=self._yview)
+        tree.bind("<Configure>", self._on_configure)
+        tree.bind("<MouseWheel>", lambda e: self._scroll(-1 if e.delta > 0 else 1))
+        tree.bind("<Button-4>", lambda _e: self._scroll(-1))
+        tree.bind("<Button-5>", lambda _e: self._scroll(1))
+
+    def set_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        self.rows = rows
+        self.offset = 0
+        self._render()
+
+    def _on_configure(self, _event: Any) -> None:
+        # Resizes, fonts, themes and DPI scaling change what fits; measure again.
+        self._row_height = None
+        self._render()
+
+    def _measure(self) -> None:
+        items = self.tree.get_children()
+        bbox = self.tree.bbox(items[0]) if items else ""
+        if bbox:
+            _x, self._rows_top, _width, self._row_height = bbox
+
+    def _visible(self) -> int:
+        """Number of rows that fit entirely in the widget."""
+
+        height = self.tree.winfo_height()
+        if height <= 1:  # not mapped yet
+            return int(self.tree.cget("height"))
+        if self._row_height:
+            row_height, top = self._row_height, self._rows_top
+        else:
+            # Style guess until a row is measured; assume one row's worth of headings.
+            row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+            top = row_height
+        return max(1, (height - top) // row_height)
+
+    def _scroll(self, lines: int) -> str:
+        self._move_to(self.offset + lines * 3)
+        return "break"
+
+    def _yview(self, *args: str) -> None:
+        visible = self._visible()
+        if args[0] == "moveto":
+            self._move_to(round(float(args[1]) * len(self.rows)))
+        elif args[0] == "scroll":
+            step = visible if args[2] == "pages" else 1
+            self._move_to(self.offset + int(args[1]) * step)
+
+    def _move_to(self, offset: int) -> None:
+        self.offset = offset
+        self._render()
+
+    def _render(self) -> None:
+        visible = self._fill()
+        self._measure()
+        if self._visible() != visible:
+            # The measured row height differs from the estimate; refill so the
+            # last row at the maximum offset is not clipped.
+            self._fill()
+
+    def _fill(self) -> int:
+        visible = self._visible()
+        # Clamp here so a resize or a shorter refresh keeps the final row in view.
+        self.offset = max(0, min(self.offset, len(self.rows) - visible))
+        window: List[Sequence[Any]] = list(self.rows[self.offset : self.offset + visible])
+        items = self.tree.get_children()
+        for iid, values in zip(items, window):
+            self.tree.item(iid, values=values)
+        if len(items) > len(window):
+            self.tree.delete(*items[len(window):])
+        _insert_rows(self.tree, window[len(items):])
+        total = len(self.rows) or 1
+        self.scrollbar.set(self.offset / total, min(1.0, (self.offset + visible) / total))
+        return visible
+
 
 class Dashboard(tk.Tk):
     """Simple three-tab UI for data exploration and operations."""
@@ -28,7 +209,24 @@ class Dashboard(tk.Tk):
         self.geometry("1000x700")
         self.service = service
         self.service.set_status_callback(self._update_status)
+        self.service.set_data_callback(self._on_data_changed)
         self._status_var = tk.StringVar(value="Ready")
+        self._debounce_jobs: Dict[str, str] = {}
+        self._pending_status: Optional[str] = None
+        self._status_scheduled = False
+        # Views awaiting a refresh after backend runs; touched only on the Tk thread.
+        self._refresh_queue: set = set()
+        self._refresh_drain_job: Optional[str] = None
+        # Latest request number per background query key (see ``_run_bg``).
+        self._bg_tokens: Dict[str, int] = {}
+        # (location_key, rows) from the last env query, reused by chart-only refreshes.
+        self._env_rows: Optional[tuple] = None
+        # Timestamps currently laid out as env x tick labels.
+        self._last_env_times: tuple = ()
+        # Inputs of the last chart/table renders; identical inputs skip the redraw.
+        self._last_env_chart: Optional[tuple] = None
+        self._last_macro_chart: Optional[tuple] = None
+        self._last_macro_latest: Optional[list] = None
 
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(fill="both", expand=True)
@@ -52,10 +250,8 @@ class Dashboard(tk.Tk):
         top = ttk.Frame(self.env_tab)
         top.pack(fill="x", padx=10, pady=5)
         ttk.Label(top, text="Location:").pack(side="left")
-        self.env_location = tk.StringVar(value=config.LOCATIONS[0].key)
-        loc_names = [f"{loc.name} ({loc.key})" for loc in config.LOCATIONS]
-        self.loc_map = {loc.key: loc.name for loc in config.LOCATIONS}
-        self.loc_dropdown = ttk.Combobox(top, textvariable=self.env_location, values=[loc.key for loc in config.LOCATIONS], state="readonly")
+        self.env_location = tk.StringVar(value=_LOC_KEYS[0])
+        self.loc_dropdown = ttk.Combobox(top, textvariable=self.env_location, values=_LOC_KEYS, state="readonly")
         self.loc_dropdown.pack(side="left", padx=5)
         self.loc_dropdown.bind("<<ComboboxSelected>>", lambda e: self._refresh_env())
 
@@ -81,9 +277,9 @@ class Dashboard(tk.Tk):
             self.env_table.heading(col, text=col)
             self.env_table.column(col, width=100)
         self.env_table.pack(side="left", fill="both", expand=True)
-        scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.env_table.yview)
-        self.env_table.configure(yscrollcommand=scrollbar.set)
+        scrollbar = ttk.Scrollbar(table_frame, orient="vertical")
         scrollbar.pack(side="right", fill="y")
+        self.env_rows_view = _VirtualTree(self.env_table, scrollbar)
 
         chart_frame = ttk.Frame(self.env_tab)
         chart_frame.pack(fill="both", expand=True, padx=10, pady=5)
@@ -92,35 +288,45 @@ class Dashboard(tk.Tk):
         ttk.Label(series_frame, text="Series:").pack(side="left")
         self.env_series = tk.StringVar(value="european_aqi")
         ttk.Combobox(series_frame, textvariable=self.env_series, values=["european_aqi", "pm2_5"], state="readonly").pack(side="left", padx=5)
-        self.env_series.trace_add("write", lambda *_: self._refresh_env_chart())
+        self.env_series.trace_add("write", lambda *_: self._debounce("env_chart", self._refresh_env_chart))
 
-        self.env_fig = Figure(figsize=(6, 3))
+        # Fixed margins (room for the rotated timestamps) instead of a
+        # layout engine re-measuring ticks and legend on every draw.
+        self.env_fig = Figure(figsize=(6, 3), layout="none")
+        self.env_fig.subplots_adjust(left=0.1, right=0.95, top=0.9, bottom=0.3)
         self.env_ax = self.env_fig.add_subplot(111)
         self.env_canvas = FigureCanvasTkAgg(self.env_fig, master=chart_frame)
         self.env_canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.env_chart = _BlitChart(self.env_canvas, self.env_ax)
+        self.env_chart.line("series")
+        self.env_chart.line("temp_c", linestyle="--")
 
     def _build_macro_tab(self) -> None:
         top = ttk.Frame(self.macro_tab)
         top.pack(fill="x", padx=10, pady=5)
         ttk.Label(top, text="Indicator:").pack(side="left")
-        self.macro_indicator = tk.StringVar(value=list(config.WB_INDICATORS.keys())[0])
-        self.ind_dropdown = ttk.Combobox(top, textvariable=self.macro_indicator, values=list(config.WB_INDICATORS.keys()), state="readonly")
+        self.macro_indicator = tk.StringVar(value=_WB_KEYS[0])
+        self.ind_dropdown = ttk.Combobox(top, textvariable=self.macro_indicator, values=_WB_KEYS, state="readonly")
         self.ind_dropdown.pack(side="left", padx=5)
-        self.ind_dropdown.bind("<<ComboboxSelected>>", lambda e: self._refresh_macro())
+        self.ind_dropdown.bind("<<ComboboxSelected>>", lambda e: self._schedule_macro_refresh())
 
         ttk.Label(top, text="Start Year:").pack(side="left")
         self.start_year = tk.IntVar(value=2000)
-        ttk.Spinbox(top, from_=1960, to=2050, textvariable=self.start_year, width=6, command=self._refresh_macro).pack(side="left", padx=2)
+        ttk.Spinbox(top, from_=1960, to=2050, textvariable=self.start_year, width=6, command=self._schedule_macro_refresh).pack(side="left", padx=2)
         ttk.Label(top, text="End Year:").pack(side="left")
         self.end_year = tk.IntVar(value=datetime.now().year)
-        ttk.Spinbox(top, from_=1960, to=2050, textvariable=self.end_year, width=6, command=self._refresh_macro).pack(side="left", padx=2)
+        ttk.Spinbox(top, from_=1960, to=2050, textvariable=self.end_year, width=6, command=self._schedule_macro_refresh).pack(side="left", padx=2)
 
         chart_frame = ttk.Frame(self.macro_tab)
         chart_frame.pack(fill="both", expand=True, padx=10, pady=5)
-        self.macro_fig = Figure(figsize=(6, 3))
+        self.macro_fig = Figure(figsize=(6, 3), layout="none")
+        self.macro_fig.subplots_adjust(left=0.1, right=0.95, top=0.9, bottom=0.15)
         self.macro_ax = self.macro_fig.add_subplot(111)
         self.macro_canvas = FigureCanvasTkAgg(self.macro_fig, master=chart_frame)
         self.macro_canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.macro_chart = _BlitChart(self.macro_canvas, self.macro_ax)
+        for code in config.WB_REGIONS:
+            self.macro_chart.line(code)
 
         table_frame = ttk.Frame(self.macro_tab)
         table_frame.pack(fill="both", expand=True, padx=10, pady=5)
@@ -178,25 +384,76 @@ class Dashboard(tk.Tk):
             self.source_log.heading(col, text=col)
             self.source_log.column(col, width=120, anchor="w")
         self.source_log.pack(side="left", fill="both", expand=True)
-        scrollbar = ttk.Scrollbar(log_frame, orient="vertical", command=self.source_log.yview)
-        self.source_log.configure(yscrollcommand=scrollbar.set)
+        scrollbar = ttk.Scrollbar(log_frame, orient="vertical")
         scrollbar.pack(side="right", fill="y")
+        self.source_log_view = _VirtualTree(self.source_log, scrollbar)
         ttk.Button(self.ops_tab, text="Refresh log", command=self._refresh_source_log).pack(anchor="e", padx=10, pady=5)
         self._refresh_source_log()
 
+    def _debounce(self, key: str, callback: Callable[[], None]) -> None:
+        """Run ``callback`` once widget changes for ``key`` settle."""
+
+        job = self._debounce_jobs.pop(key, None)
+        if job is not None:
+            self.after_cancel(job)
+
+        def run() -> None:
+            self._debounce_jobs.pop(key, None)
+            callback()
+
+        self._debounce_jobs[key] = self.after(REFRESH_DEBOUNCE_MS, run)
+
+    def _schedule_macro_refresh(self) -> None:
+        self._debounce("macro", self._refresh_macro)
+
     def _update_status(self, text: str) -> None:
         if threading.current_thread() is threading.main_thread():
             self._status_var.set(text)
         else:
-            # Marshal updates to the Tk event loop to avoid cross-thread Tkinter access
-            self.after(0, lambda: self._status_var.set(text))
+            # Marshal updates to the Tk event loop to avoid cross-thread Tkinter
+            # access; only the latest message matters, so one flush is queued
+            # at a time.
+            self._pending_status = text
+            if not self._status_scheduled:
+                self._status_scheduled = True
+                self.after(STATUS_FLUSH_MS, self._flush_status)
+
+    def _flush_status(self) -> None:
+        # Clear the flag before reading so a message posted meanwhile queues a new flush.
+        self._status_scheduled = False
+        text, self._pending_status = self._pending_status, None
+        if text is not None:
+            self._status_var.set(text)
+
+    def _on_data_changed(self, source: str) -> None:
+        # Called from fetch threads; hand the views over to the Tk thread.
+        self.after(0, self._queue_refresh, _SOURCE_VIEWS.get(source, ("log",)))
+
+    def _queue_refresh(self, views) -> None:
+        self._refresh_queue.update(views)
+        if self._refresh_drain_job is None:
+            self._refresh_drain_job = self.after(REFRESH_DRAIN_MS, self._drain_refresh)
+
+    def _drain_refresh(self) -> None:
+        """Refresh every view queued since the last drain, once each."""
+
+        self._refresh_drain_job = None
+        views, self._refresh_queue = self._refresh_queue, set()
+        if "env" in views:
+            self._env_rows = None
+            self._refresh_env()
+        if "macro" in views:
+            self._refresh_macro()
+        if "log" in views:
+            self._refresh_source_log()
 
     def _refresh_db_status(self) -> None:
         self.mongo_status.config(text=f"Mongo: {'connected' if self.service.mongo.available else 'unavailable'}")
         self.sqlite_status.config(text="SQLite: connected")
 
     def _run_fetch_async(self) -> None:
-        threading.Thread(target=self.service.fetch_all, daemon=True).start()
+        # A manual fetch is an explicit request for fresh data, so skip the HTTP cache.
+        threading.Thread(target=self.service.fetch_all, kwargs={"force_refresh": True}, daemon=True).start()
 
     def _start_scheduler(self) -> None:
         if not self.service.mongo.available:
@@ -214,16 +471,39 @@ class Dashboard(tk.Tk):
         wiki_minutes = max(1, self.wiki_interval_min.get())
         self.service.update_intervals(env_minutes * 60, macro_minutes * 60, wiki_minutes * 60)
 
+    def _run_bg(self, key: str, fn: Callable[[], Any], on_done: Callable[[Any], None]) -> None:
+        """Run ``fn`` on a worker thread and hand its result to ``on_done`` on the Tk thread.
+
+        Only the newest request per ``key`` is delivered, so a slow query
+        cannot overwrite the result of one issued after it.
+        """
+
+        token = self._bg_tokens[key] = self._bg_tokens.get(key, 0) + 1
+
+        def deliver(result: Any) -> None:
+            if self._bg_tokens.get(key) == token:
+                on_done(result)
+
+        def target() -> None:
+            try:
+                result = fn()
+            except Exception:  # noqa: BLE001
+                logger.exception("Background %s query failed", key)
+                return
+            self.after(0, lambda: deliver(result))
+
+        threading.Thread(target=target, daemon=True).start()
+
     def _refresh_source_log(self) -> None:
-        self.source_log.delete(*self.source_log.get_children())
-        rows = self.service.sqlite.latest_source_runs(limit=100)
-        for row in rows:
-            source, started, finished, ok, message, count = row
-            self.source_log.insert(
-                "",
-                "end",
-                values=(source, started, finished, "ok" if ok else "fail", message, count),
-            )
+        self._run_bg("source_log", lambda: self.service.sqlite.latest_source_runs(limit=100), self._show_source_log)
+
+    def _show_source_log(self, rows) -> None:
+        self.source_log_view.set_rows(
+            [
+                (source, started, finished, "ok" if ok else "fail", message, count)
+                for source, started, finished, ok, message, count in rows
+            ]
+        )
 
     def _export_csv(self) -> None:
         file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")])
@@ -231,26 +511,33 @@ class Dashboard(tk.Tk):
             return
         if self.notebook.index(self.notebook.select()) == 0:
             loc = self.env_location.get()
-            rows = self.service.sqlite.latest_env_rows(loc, limit=200)
+            query = partial(self.service.sqlite.iter_latest_env_rows, loc, limit=200)
             headers = ["ts_utc", "temp_c", "wind_kph", "precip_mm", "pm2_5", "pm10", "european_aqi", "us_aqi"]
         else:
-            indicator = self.macro_indicator.get()
-            rows = self.service.sqlite.macro_series(indicator, self.start_year.get(), self.end_year.get())
+            indicator, start, end = self.macro_indicator.get(), self.start_year.get(), self.end_year.get()
+            query = partial(self.service.sqlite.iter_macro_series, indicator, start, end)
             headers = ["region_code", "year", "value"]
-        with open(file_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
-            for row in rows:
-                writer.writerow(row)
-        messagebox.showinfo("Export", f"Saved to {file_path}")
+
+        def write() -> str:
+            with open(file_path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(headers)
+                writer.writerows(query())
+            return file_path
+
+        self._run_bg("export", write, lambda path: messagebox.showinfo("Export", f"Saved to {path}"))
 
     def _refresh_env(self) -> None:
         loc_key = self.env_location.get()
-        self.env_table.delete(*self.env_table.get_children())
-        rows = self.service.sqlite.latest_env_rows(loc_key, limit=48)
-        for row in rows:
-            self.env_table.insert("", "end", values=row)
-        kpi = self.service.sqlite.latest_env_kpis(loc_key)
+        self._run_bg(
+            "env",
+            partial(self.service.sqlite.latest_env_snapshot, loc_key, limit=48),
+            lambda result: self._show_env(loc_key, *result),
+        )
+
+    def _show_env(self, loc_key: str, rows, kpi) -> None:
+        self._env_rows = (loc_key, rows)
+        self.env_rows_view.set_rows(rows)
         if kpi:
             ts, temp, wind, precip, pm25, pm10, aqi_eu, aqi_us = kpi
             self.kpi_labels["ts"].config(text=f"Last update: {ts}")
@@ -260,52 +547,98 @@ class Dashboard(tk.Tk):
             self.kpi_labels["pm25"].config(text=f"PM2.5: {pm25}")
             self.kpi_labels["pm10"].config(text=f"PM10: {pm10}")
             self.kpi_labels["aqi"].config(text=f"AQI(EU/US): {aqi_eu}/{aqi_us}")
-        self._refresh_env_chart()
+        # The chart plots the same 48 rows, so it has no query of its own.
+        self._draw_env_chart(rows)
 
     def _refresh_env_chart(self) -> None:
         loc_key = self.env_location.get()
+        if self._env_rows is not None and self._env_rows[0] == loc_key:
+            self._draw_env_chart(self._env_rows[1])
+        else:
+            # The env snapshot feeds the chart as well.
+            self._refresh_env()
+
+    def _draw_env_chart(self, rows) -> None:
         series = self.env_series.get()
-        rows = list(reversed(self.service.sqlite.latest_env_rows(loc_key, limit=48)))
-        times = [row[0] for row in rows]
-        values = [row[6] if series == "european_aqi" else row[4] for row in rows]
-        temp_series = [row[1] for row in rows]
-        self.env_ax.clear()
-        self.env_ax.plot(times, values, label=series)
-        self.env_ax.plot(times, temp_series, label="temp_c", linestyle="--")
-        self.env_ax.set_xticklabels(times, rotation=45, ha="right")
+        # Compare full rows, not just the newest timestamp: upserts revise
+        # values of hours that are already stored.
+        chart_key = (series, rows)
+        if chart_key == self._last_env_chart:
+            return
+        self._last_env_chart = chart_key
+        # One transposing pass into chronological columns; the rows arrive
+        # newest first because the table shows them that way.
+        columns = list(zip(*reversed(rows))) or [()] * 8
+        times = columns[0]
+        values = columns[6 if series == "european_aqi" else 4]
+        temp_series = columns[1]
+        # Plot against positions (labelled with the timestamps) so the lines
+        # can be updated in place without accumulating categorical units.
+        positions = range(len(times))
+        series_line = self.env_chart.lines["series"]
+        series_line.set_data(positions, values)
+        series_line.set_label(series)
+        self.env_chart.lines["temp_c"].set_data(positions, temp_series)
+        if times != self._last_env_times:
+            # Rebuilding tick labels re-lays out every Text, so only do it when
+            # they change, and label a thinned subset of the hours.
+            ticks = positions[:: max(1, -(-len(times) // ENV_MAX_XTICKS))]
+            self.env_ax.set_xticks(ticks)
+            self.env_ax.set_xticklabels([times[i] for i in ticks], rotation=45, ha="right")
+            self._last_env_times = times
         self.env_ax.legend()
         self.env_ax.set_title(f"{series} vs temp")
-        self.env_canvas.draw()
+        self.env_chart.update((series, times))
 
     def _refresh_macro(self) -> None:
         indicator = self.macro_indicator.get()
         start = self.start_year.get()
         end = self.end_year.get()
-        rows = self.service.sqlite.macro_series(indicator, start, end)
-        series_by_region = {code: [] for code in config.WB_REGIONS.keys()}
-        for region, year, value in rows:
-            series_by_region.setdefault(region, []).append((year, value))
-        self.macro_ax.clear()
+        sqlite = self.service.sqlite
+        self._run_bg(
+            "macro",
+            lambda: (sqlite.macro_series(indicator, start, end), sqlite.macro_latest(indicator)),
+            lambda result: self._show_macro(indicator, start, end, *result),
+        )
+
+    def _show_macro(self, indicator: str, start: int, end: int, rows, latest_rows) -> None:
+        chart_key = (indicator, start, end, rows)
+        if chart_key != self._last_macro_chart:
+            self._last_macro_chart = chart_key
+            self._draw_macro_chart(indicator, start, end, rows)
+        if latest_rows != self._last_macro_latest:
+            self._last_macro_latest = latest_rows
+            self._show_macro_latest(latest_rows)
+
+    def _draw_macro_chart(self, indicator: str, start: int, end: int, rows) -> None:
         years = list(range(start, end + 1))
-        for region, data in series_by_region.items():
-            data_dict = {y: v for y, v in data}
-            vals = [data_dict.get(y) for y in years]
-            self.macro_ax.plot(years, vals, label=region)
+        n = len(years)
+        series_by_region = {code: [None] * n for code in config.WB_REGIONS.keys()}
+        for region, year, value in rows:
+            i = year - start
+            if 0 <= i < n:
+                series_by_region.setdefault(region, [None] * n)[i] = value
+        for region, vals in series_by_region.items():
+            self.macro_chart.line(region).set_data(years, vals)
         self.macro_ax.legend()
         self.macro_ax.set_title(indicator)
-        self.macro_canvas.draw()
+        self.macro_chart.update((indicator, start, end))
 
+    def _show_macro_latest(self, latest_rows) -> None:
         self.macro_table.delete(*self.macro_table.get_children())
-        latest_rows = self.service.sqlite.macro_latest(indicator)
-        seen = set()
+        # One pass: index every (region, year) and keep each region's first
+        # (latest) row in first-seen order.
+        by_region_year = {}
+        latest_by_region = {}
         for region, year, value in latest_rows:
-            if region in seen:
-                continue
-            prev_year = year - 1
-            prev = next((v for r, y, v in latest_rows if r == region and y == prev_year), None)
+            by_region_year[(region, year)] = value
+            latest_by_region.setdefault(region, (year, value))
+        table_rows = []
+        for region, (year, value) in latest_by_region.items():
+            prev = by_region_year.get((region, year - 1))
             delta = value - prev if prev is not None and value is not None else None
-            self.macro_table.insert("", "end", values=(region, year, value, delta))
-            seen.add(region)
+            table_rows.append((region, year, value, delta))
+        _insert_rows(self.macro_table, table_rows)
 
     def refresh_all(self) -> None:
         self._refresh_env()
@@ -0,0 +1,157 @@
+import importlib.util
+import os
+import queue
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+tkinter_available = importlib.util.find_spec("tkinter") is not None
+
+if tkinter_available:
+    from src.ui import dashboard
+    from src.ui.dashboard import Dashboard
+
+ENV_ROW = ("2024-01-01T01:00:00Z", 6.0, 11.0, 0.1, 3.0, 4.0, 50.0, 58.0)
+
+
+class _Var:
+    def __init__(self, value) -> None:
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class _FakeTree:
+    """Treeview stand-in whose rows render ``row_height`` pixels tall below ``top``."""
+
+    def __init__(self, height: int, row_height: int, top: int) -> None:
+        self.height, self.row_height, self.top = height, row_height, top
+        self.items: dict = {}
+        self._next_iid = 0
+        self.tk = SimpleNamespace(call=self._tcl)
+
+    def _tcl(self, *args) -> None:
+        for values in args[2]:  # foreach values <rows> "<path> insert ..."
+            self.items[f"I{self._next_iid}"] = values
+            self._next_iid += 1
+
+    def bind(self, *_args) -> None:
+        pass
+
+    def winfo_height(self) -> int:
+        return self.height
+
+    def cget(self, _option):
+        return 10
+
+    def get_children(self) -> tuple:
+        return tuple(self.items)
+
+    def item(self, iid, values) -> None:
+        self.items[iid] = values
+
+    def delete(self, *iids) -> None:
+        for iid in iids:
+            del self.items[iid]
+
+    def bbox(self, _iid):
+        return (0, self.top, 100, self.row_height)
+
+
+@unittest.skipUnless(tkinter_available, "tkinter is not installed")
+class VirtualTreeTests(unittest.TestCase):
+    def test_window_uses_measured_row_height(self) -> None:
+        # 30px rows under a 25px heading: only 5 of them fit in 200px, while the
+        # 20px style default would have suggested 9.
+        tree = _FakeTree(height=200, row_height=30, top=25)
+        with patch.object(dashboard.ttk, "Style") as style:
+            style.return_value.lookup.return_value = 20
+            view = dashboard._VirtualTree(tree, MagicMock())
+            view.set_rows([(i,) for i in range(100)])
+            self.assertEqual(len(tree.items), 5)
+            view._move_to(1_000)
+        self.assertEqual(view.offset, 95)
+        self.assertEqual(list(tree.items.values())[-1], (99,))
+        self.assertLessEqual(tree.top + len(tree.items) * tree.row_height, tree.height)
+
+
+@unittest.skipUnless(tkinter_available, "tkinter is not installed")
+class DashboardRefreshTests(unittest.TestCase):
+    """Drive the refresh paths on a dashboard whose Tk root is never created."""
+
+    def setUp(self) -> None:
+        self.sqlite = MagicMock()
+        self.delivered: "queue.Queue" = queue.Queue()
+        self.dash = Dashboard.__new__(Dashboard)
+        self.dash.service = SimpleNamespace(sqlite=self.sqlite)
+        self.dash._bg_tokens = {}
+        # Stand-in for Tk's after(): hand callbacks from worker threads to the test.
+        self.dash.after = lambda _ms, fn, *args: self.delivered.put((fn, args))
+        self.dash.env_location = _Var("ams")
+        self.dash.macro_indicator = _Var("FP.CPI.TOTL.ZG")
+        self.dash.start_year = _Var(2020)
+        self.dash.end_year = _Var(2023)
+
+    def _deliver(self) -> None:
+        fn, args = self.delivered.get(timeout=5)
+        fn(*args)
+
+    def test_refresh_env_delivers_snapshot(self) -> None:
+        self.sqlite.latest_env_snapshot.return_value = ([ENV_ROW], ENV_ROW)
+        self.dash._show_env = MagicMock()
+        self.dash._refresh_env()
+        self._deliver()
+        self.sqlite.latest_env_snapshot.assert_called_once_with("ams", limit=48)
+        self.dash._show_env.assert_called_once_with("ams", [ENV_ROW], ENV_ROW)
+
+    def test_refresh_macro_delivers_series_and_latest(self) -> None:
+        self.sqlite.macro_series.return_value = [("NLD", 2023, 4.2)]
+        self.sqlite.macro_latest.return_value = [("NLD", 2023, 4.2)]
+        self.dash._show_macro = MagicMock()
+        self.dash._refresh_macro()
+        self._deliver()
+        self.dash._show_macro.assert_called_once_with(
+            "FP.CPI.TOTL.ZG", 2020, 2023, [("NLD", 2023, 4.2)], [("NLD", 2023, 4.2)]
+        )
+
+    def test_export_csv_writes_env_rows(self) -> None:
+        temp_dir = tempfile.mkdtemp(prefix="ecopulse_export_test_")
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        path = os.path.join(temp_dir, "env.csv")
+        self.sqlite.iter_latest_env_rows.return_value = iter([ENV_ROW])
+        self.dash.notebook = MagicMock()
+        self.dash.notebook.index.return_value = 0
+        with patch.object(dashboard.filedialog, "asksaveasfilename", return_value=path), patch.object(
+            dashboard.messagebox, "showinfo"
+        ) as showinfo:
+            self.dash._export_csv()
+            self._deliver()
+        showinfo.assert_called_once_with("Export", f"Saved to {path}")
+        self.sqlite.iter_latest_env_rows.assert_called_once_with("ams", limit=200)
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[0], "ts_utc,temp_c,wind_kph,precip_mm,pm2_5,pm10,european_aqi,us_aqi")
+        self.assertEqual(lines[1], ",".join(str(v) for v in ENV_ROW))
+
+    def test_env_chart_labels_at_most_max_ticks(self) -> None:
+        from matplotlib.figure import Figure
+
+        self.dash.env_series = _Var("european_aqi")
+        self.dash.env_chart = MagicMock()
+        for hours in (1, 7, 8, 9, 15, 47, 48):
+            with self.subTest(hours=hours):
+                self.dash.env_ax = Figure().add_subplot()
+                self.dash._last_env_chart = None
+                self.dash._last_env_times = ()
+                rows = [(f"2024-01-01T{h:02d}:00Z",) + ENV_ROW[1:] for h in range(hours)][::-1]
+                self.dash._draw_env_chart(rows)
+                labels = [label.get_text() for label in self.dash.env_ax.get_xticklabels()]
+                self.assertLessEqual(len(labels), dashboard.ENV_MAX_XTICKS)
+                self.assertEqual(labels[0], "2024-01-01T00:00Z")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,15 @@
 import importlib.util
 import os
 import shutil
+import sqlite3
 import tempfile
 import unittest
+import zlib
 
+from contextlib import closing
 from dataclasses import dataclass
 from datetime import datetime
+from unittest.mock import MagicMock, patch
 
 from src.config import config
 from src.storage.sqlite_storage import SQLiteStorage
@@ -13,6 +17,8 @@ from src.storage.sqlite_storage import SQLiteStorage
 pymongo_available = importlib.util.find_spec("pymongo") is not None
 
 if pymongo_available:
+    from pymongo.errors import BulkWriteError
+
     from src.storage.mongo_storage import MongoStorage
 
 
@@ -90,10 +96,97 @@ class SQLiteStorageTests(unittest.TestCase):
         self.assertEqual(env_after, (7.5, 12.0, 0.3))
         self.assertEqual(macro_after[0], 4.5)
 
+    def test_bulk_wiki_update_uses_url_lookup(self) -> None:
+        keys_by_url = self.sqlite.location_keys_by_wiki_url()
+        loc = config.LOCATIONS[0]
+        self.assertIn(loc.key, keys_by_url[loc.wikipedia_url])
+
+        self.sqlite.update_locations_wiki([("Title", "Summary", key) for key in keys_by_url[loc.wikipedia_url]])
+        with self.sqlite.conn as conn:
+            row = conn.execute(
+                "SELECT wiki_title, wiki_summary FROM dim_location WHERE location_key=?", (loc.key,)
+            ).fetchone()
+        self.assertEqual(row, ("Title", "Summary"))
+
+    def test_reads_use_read_only_connections(self) -> None:
+        self.sqlite.upsert_env_hourly([("ams", "2024-01-01T00:00:00Z", 5.0, 10.0, 0.2, 3.3, 4.4, 55.0, 60.0)])
+        self.assertEqual(self.sqlite.latest_env_kpis("ams")[1], 5.0)
+        with self.sqlite._with_reader() as cur:
+            with self.assertRaises(sqlite3.OperationalError):
+                cur.execute("DELETE FROM fact_env_hourly")
+
+    def test_iter_rows_stream_and_release_reader(self) -> None:
+        self.sqlite.upsert_macro([("NLD", "FP.CPI.TOTL.ZG", 2022, 4.0), ("NLD", "FP.CPI.TOTL.ZG", 2023, 4.2)])
+        readers = self.sqlite._readers.qsize()
+        rows = self.sqlite.iter_macro_series("FP.CPI.TOTL.ZG", 2020, 2024)
+        self.assertEqual(next(rows), ("NLD", 2022, 4.0))
+        self.assertEqual(self.sqlite._readers.qsize(), readers - 1)
+        rows.close()
+        self.assertEqual(self.sqlite._readers.qsize(), readers)
+        self.assertEqual(
+            self.sqlite.macro_series("FP.CPI.TOTL.ZG", 2020, 2024),
+            [("NLD", 2022, 4.0), ("NLD", 2023, 4.2)],
+        )
+
+    def test_macro_queries_use_covering_index(self) -> None:
+        plan = self.sqlite.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT region_code, year, value FROM fact_macro_annual WHERE indicator_code=? ORDER BY year DESC",
+            ("FP.CPI.TOTL.ZG",),
+        ).fetchall()
+        self.assertIn("COVERING INDEX idx_macro_ind_year", plan[0][-1])
+
+    def test_transaction_groups_writes_and_rolls_back(self) -> None:
+        row = ("ams", "2024-01-01T00:00:00Z", 5.0, 10.0, 0.2, 3.3, 4.4, 55.0, 60.0)
+        with self.assertRaises(RuntimeError):
+            with self.sqlite.transaction():
+                self.sqlite.upsert_env_hourly([row])
+                self.sqlite.log_source_run("environment", "start", "end", False, "boom", 0)
+                raise RuntimeError("abort")
+        self.assertIsNone(self.sqlite.latest_env_kpis("ams"))
+        self.assertEqual(self.sqlite.latest_source_runs(), [])
+
+        with self.sqlite.transaction():
+            self.sqlite.upsert_env_hourly([row])
+        self.assertEqual(self.sqlite.latest_env_kpis("ams")[1], 5.0)
+
+    def test_latest_env_kpis_all_matches_per_location_lookup(self) -> None:
+        self.sqlite.upsert_env_hourly(
+            [
+                ("ams", "2024-01-01T00:00:00Z", 5.0, 10.0, 0.2, 3.3, 4.4, 55.0, 60.0),
+                ("ams", "2024-01-01T01:00:00Z", 6.0, 11.0, 0.1, 3.0, 4.0, 50.0, 58.0),
+                ("bru", "2024-01-01T00:00:00Z", 7.0, 12.0, 0.0, 2.0, 3.0, 40.0, 45.0),
+            ]
+        )
+        latest = self.sqlite.latest_env_kpis_all()
+        self.assertEqual(set(latest), {"ams", "bru"})
+        for key, row in latest.items():
+            self.assertEqual(row, self.sqlite.latest_env_kpis(key))
+
+    def test_latest_env_snapshot_matches_separate_queries(self) -> None:
+        self.sqlite.upsert_env_hourly(
+            [
+                ("ams", "2024-01-01T00:00:00Z", 5.0, 10.0, 0.2, 3.3, 4.4, 55.0, 60.0),
+                ("ams", "2024-01-01T01:00:00Z", 6.0, 11.0, 0.1, 3.0, 4.0, 50.0, 58.0),
+            ]
+        )
+        self.assertEqual(
+            self.sqlite.latest_env_snapshot("ams"),
+            (self.sqlite.latest_env_rows("ams"), self.sqlite.latest_env_kpis("ams")),
+        )
+        self.assertEqual(self.sqlite.latest_env_snapshot("bru"), ([], None))
+
+    def test_run_log_rides_along_with_next_commit(self) -> None:
+        self.sqlite.log_run("start", "end", True, "ok")
+        count = "SELECT COUNT(*) FROM fetch_run_log"
+        self.assertEqual(self.sqlite.conn.execute(count).fetchone()[0], 0)
+        self.sqlite.upsert_macro([("NLD", "FP.CPI.TOTL.ZG", 2023, 4.2)])
+        self.assertEqual(self.sqlite.conn.execute(count).fetchone()[0], 1)
+
     def test_run_log_records_entries(self) -> None:
         started = datetime.utcnow().isoformat()
         finished = datetime.utcnow().isoformat()
         self.sqlite.log_run(started, finished, True, "ok")
+        self.sqlite.flush_run_log()
         with self.sqlite.conn as conn:
             row = conn.execute(
                 "SELECT started_at_utc, finished_at_utc, ok, message FROM fetch_run_log ORDER BY run_id DESC LIMIT 1"
@@ -103,6 +196,43 @@ class SQLiteStorageTests(unittest.TestCase):
         self.assertEqual(row[2], 1)
         self.assertEqual(row[3], "ok")
 
+    def test_first_ingest_gathers_planner_stats(self) -> None:
+        stat_tables = "SELECT DISTINCT tbl FROM sqlite_stat1"
+        self.assertEqual(self.sqlite._unanalyzed, {"fact_env_hourly", "fact_macro_annual"})
+        self.sqlite.upsert_env_hourly([("ams", "2024-01-01T00:00:00Z", 5.0, 10.0, 0.2, 3.3, 4.4, 55.0, 60.0)])
+        self.assertIn(("fact_env_hourly",), self.sqlite.conn.execute(stat_tables).fetchall())
+        self.assertEqual(self.sqlite._unanalyzed, {"fact_macro_annual"})
+
+
+@unittest.skipUnless(pymongo_available, "pymongo is not installed; install requirements to test MongoDB")
+class AppServiceShutdownTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.orig_sqlite_path = config.SQLITE_FILE
+        self.temp_dir = tempfile.mkdtemp(prefix="ecopulse_shutdown_test_")
+        config.SQLITE_FILE = os.path.join(self.temp_dir, "ecopulse.sqlite")
+
+    def tearDown(self) -> None:
+        config.SQLITE_FILE = self.orig_sqlite_path
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_shutdown_closes_sqlite_with_stats_and_run_log(self) -> None:
+        from src.app_service import AppService
+
+        with patch("src.app_service.MongoStorage"):
+            service = AppService()
+        with service.sqlite.transaction():
+            service.sqlite.upsert_macro([("NLD", "FP.CPI.TOTL.ZG", 2023, 4.2)])
+        service.sqlite.log_run("start", "end", True, "ok")
+        service.shutdown()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            service.sqlite.conn.execute("SELECT 1")
+
+        with closing(sqlite3.connect(config.SQLITE_FILE)) as conn:
+            stat_tables = {row[0] for row in conn.execute("SELECT tbl FROM sqlite_stat1")}
+            run_count = conn.execute("SELECT COUNT(*) FROM fetch_run_log").fetchone()[0]
+        self.assertIn("fact_macro_annual", stat_tables)
+        self.assertEqual(run_count, 1)
+
 
 @unittest.skipUnless(pymongo_available, "pymongo is not installed; install requirements to test MongoDB")
 class MongoStorageTests(unittest.TestCase):
@@ -112,7 +242,7 @@ class MongoStorageTests(unittest.TestCase):
         self.mongo = MongoStorage()
 
     def tearDown(self) -> None:
-        if self.mongo.client:
+        if self.mongo.available:
             self.mongo.client.drop_database(config.DB_NAME)
         config.DB_NAME = self.original_db_name
 
@@ -143,6 +273,7 @@ class MongoStorageTests(unittest.TestCase):
 
         self.mongo.log_fetch(fetch_result)
         self.mongo.log_scrape(scrape_result)
+        self.mongo.flush()
 
         fetch_doc = self.mongo._col("raw_fetches").find_one({"source": "test-source"})
         scrape_doc = self.mongo._col("scraped_pages").find_one({"url": "http://example.com/page"})
@@ -150,6 +281,80 @@ class MongoStorageTests(unittest.TestCase):
         self.assertIsNotNone(fetch_doc, "raw_fetches should contain the inserted document")
         self.assertIsNotNone(scrape_doc, "scraped_pages should contain the inserted document")
 
+        blob = self.mongo._col("payload_blobs").find_one({"_id": fetch_doc["payload_sha256"]})
+        self.assertEqual(blob["payload_json"], {"hello": "world"})
+
+    def test_mongo_batch_logging(self) -> None:
+        if not self.mongo.available:
+            self.skipTest("MongoDB is not available (start docker compose first)")
+
+        fetch_results = [
+            DummyFetchResult(
+                source=f"batch-source-{idx}",
+                url="http://example.com",
+                params={},
+                status_code=200,
+                ok=True,
+                error=None,
+                duration_ms=1,
+                payload_json={"idx": idx},
+                payload_text=None,
+                fetched_at_utc="2024-01-01T00:00:00Z",
+            )
+            for idx in range(3)
+        ]
+        self.mongo.log_fetch_many(fetch_results)
+        self.mongo.log_fetch_many([])
+        self.assertTrue(self.mongo.flush(timeout=10))
+
+        count = self.mongo._col("raw_fetches").count_documents({"source": {"$regex": "^batch-source-"}})
+        self.assertEqual(count, 3)
+        digests = {doc["payload_sha256"] for doc in self.mongo._col("raw_fetches").find()}
+        self.assertEqual(self.mongo._col("payload_blobs").count_documents({"_id": {"$in": list(digests)}}), len(digests))
+
+    def test_fetch_doc_drops_parsed_body_and_compresses_large_text(self) -> None:
+        parsed = DummyFetchResult("s", "u", {}, 200, True, None, 1, {"a": 1}, "body", "t")
+        self.assertIsNone(MongoStorage._fetch_doc(parsed)["payload_text"])
+
+        body = "error " * 1000
+        failed = DummyFetchResult("s", "u", {}, 500, False, "boom", 1, None, body, "t")
+        doc = MongoStorage._fetch_doc(failed)
+        self.assertIsNone(doc["payload_text"])
+        self.assertEqual(zlib.decompress(doc["payload_text_zlib"]).decode(), body)
+
+    def test_identical_payloads_share_one_blob(self) -> None:
+        collections = {name: MagicMock() for name in ("raw_fetches", "payload_blobs")}
+        with patch("src.storage.mongo_storage.MongoClient"):
+            mongo = MongoStorage()
+        mongo._col = collections.__getitem__  # type: ignore[assignment]
+        mongo.log_fetch_many(
+            DummyFetchResult(f"s{idx}", "u", {}, 200, True, None, 1, {"b": 2, "a": 1}, None, "t") for idx in range(2)
+        )
+        mongo.log_fetch(DummyFetchResult("s2", "u", {}, 200, True, None, 1, {"a": 1, "b": 2}, None, "t"))
+        self.assertTrue(mongo.flush(timeout=10))
+
+        blobs = [blob for call in collections["payload_blobs"].insert_many.call_args_list for blob in call.args[0]]
+        docs = [doc for call in collections["raw_fetches"].insert_many.call_args_list for doc in call.args[0]]
+        self.assertEqual(len(blobs), 1)
+        self.assertEqual({doc["payload_sha256"] for doc in docs}, {blobs[0]["_id"]})
+        self.assertTrue(all("payload_json" not in doc for doc in docs))
+
+    def test_failed_blob_insert_is_retried(self) -> None:
+        collections = {name: MagicMock() for name in ("raw_fetches", "payload_blobs")}
+        collections["payload_blobs"].insert_many.side_effect = [
+            BulkWriteError({"writeErrors": [{"index": 0, "code": 10334, "errmsg": "too large"}]}),
+            None,
+        ]
+        with patch("src.storage.mongo_storage.MongoClient"):
+            mongo = MongoStorage()
+        mongo._col = collections.__getitem__  # type: ignore[assignment]
+        for _ in range(2):
+            mongo.log_fetch(DummyFetchResult("s", "u", {}, 200, True, None, 1, {"a": 1}, None, "t"))
+            self.assertTrue(mongo.flush(timeout=10))
+
+        self.assertEqual(collections["payload_blobs"].insert_many.call_count, 2)
+        self.assertEqual(len(mongo._known_blobs), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
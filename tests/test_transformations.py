@@ -1,12 +1,18 @@
+import json
 import os
 import shutil
 import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from unittest.mock import patch
 
 from src.config import config
 from src.sources.base import RawFetchResult
+from src.sources.openmeteo import OpenMeteoSource
+from src.sources import wikipedia
+from src.sources.wikipedia import WikipediaScraper
+from src.sources import worldbank
 from src.sources.worldbank import WorldBankSource
 from src.storage.sqlite_storage import SQLiteStorage
 from src.transform.environment import transform_environment
@@ -123,29 +129,250 @@ class TransformationTests(unittest.TestCase):
 
 
 class WorldBankSourceTests(unittest.TestCase):
-    def test_fetch_indicator_requests_full_page(self) -> None:
-        captured_params = {}
+    def test_fetch_requests_all_indicators_in_one_full_page(self) -> None:
+        calls = []
 
-        def fake_do_request(url, params):  # type: ignore[override]
-            captured_params.update(params)
+        def row(country, series, year, value):
+            return {
+                "variable": [
+                    {"concept": "Country", "id": country, "value": country},
+                    {"concept": "Series", "id": series, "value": series},
+                    {"concept": "Time", "id": f"YR{year}", "value": str(year)},
+                ],
+                "value": value,
+            }
+
+        def fake_do_request(url, params, force_refresh=False):  # type: ignore[override]
+            calls.append((url, dict(params)))
 
             class FakeResponse:
                 ok = True
                 status_code = 200
                 text = "{}"
+                headers: dict = {}
+
+                @property
+                def content(self):
+                    return json.dumps(self.json()).encode()
 
                 def json(self):
-                    return [{"page": 1, "pages": 1, "per_page": params.get("per_page")}, []]
+                    return {
+                        "page": 1,
+                        "pages": 1,
+                        "per_page": params.get("per_page"),
+                        "source": [
+                            {
+                                "id": "2",
+                                "data": [
+                                    row("NLD", "FP.CPI.TOTL.ZG", 2023, 4.5),
+                                    row("USA", "SL.UEM.TOTL.ZS", 2023, 3.6),
+                                ],
+                            }
+                        ],
+                    }
 
             return FakeResponse(), None, 5
 
         source = WorldBankSource()
         with patch("src.sources.worldbank._do_request", side_effect=fake_do_request):
-            result = source._fetch_indicator("FP.CPI.TOTL.ZG")
+            results = source.fetch()
+
+        self.assertEqual(len(calls), 1, "Expected a single bulk request")
+        url, params = calls[0]
+        for indicator in config.WB_INDICATORS:
+            self.assertIn(indicator, url)
+        self.assertGreaterEqual(params["per_page"], 1000)
+        self.assertEqual([r.source for r in results], [f"worldbank-{code}" for code in config.WB_INDICATORS])
+        by_source = {r.source: r.payload_json[1] for r in results}
+        self.assertEqual(
+            by_source["worldbank-FP.CPI.TOTL.ZG"], [{"countryiso3code": "NLD", "date": "2023", "value": 4.5}]
+        )
+        self.assertEqual(by_source["worldbank-NY.GDP.MKTP.KD.ZG"], [])
+
+    def test_unchanged_etag_skips_reparsing(self) -> None:
+        body = json.dumps(
+            {
+                "page": 1,
+                "pages": 1,
+                "source": {
+                    "data": [
+                        {
+                            "variable": [
+                                {"concept": "Country", "id": "NLD"},
+                                {"concept": "Series", "id": "FP.CPI.TOTL.ZG"},
+                                {"concept": "Time", "value": "2023"},
+                            ],
+                            "value": 4.5,
+                        }
+                    ]
+                },
+            }
+        ).encode()
+        bodies = [body, b"not json: must not be parsed"]
+
+        def fake_do_request(url, params, force_refresh=False):  # type: ignore[override]
+            class FakeResponse:
+                ok = True
+                status_code = 200
+                text = "{}"
+                headers = {"ETag": '"v1"'}
+                content = bodies.pop(0)
+
+            return FakeResponse(), None, 5
+
+        source = WorldBankSource()
+        with patch.dict(worldbank._BUCKET_CACHE, clear=True):
+            with patch("src.sources.worldbank._do_request", side_effect=fake_do_request):
+                first = source.fetch()
+                second = source.fetch(force_refresh=True)
+
+        self.assertEqual([r.payload_json for r in second], [r.payload_json for r in first])
+        self.assertEqual(second[0].payload_json[1][0]["value"], 4.5)
+
+    def test_fetch_collects_remaining_pages_concurrently(self) -> None:
+        def page_payload(page):
+            series = "FP.CPI.TOTL.ZG" if page == 1 else "SL.UEM.TOTL.ZS"
+            return {
+                "page": page,
+                "pages": 3,
+                "source": {
+                    "data": [
+                        {
+                            "variable": [
+                                {"concept": "Country", "id": "NLD"},
+                                {"concept": "Series", "id": series},
+                                {"concept": "Time", "value": str(2020 + page)},
+                            ],
+                            "value": float(page),
+                        }
+                    ]
+                },
+            }
+
+        def fake_do_request(url, params, force_refresh=False):  # type: ignore[override]
+            body = json.dumps(page_payload(params.get("page", 1))).encode()
+
+            class FakeResponse:
+                ok = True
+                status_code = 200
+                text = "{}"
+                headers: dict = {}
+                content = body
+
+            return FakeResponse(), None, 5
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            source = WorldBankSource(executor)
+            with patch("src.sources.worldbank._do_request", side_effect=fake_do_request):
+                results = source.fetch()
+
+        by_source = {r.source: r.payload_json[1] for r in results}
+        self.assertEqual([row["date"] for row in by_source["worldbank-FP.CPI.TOTL.ZG"]], ["2021"])
+        self.assertEqual([row["date"] for row in by_source["worldbank-SL.UEM.TOTL.ZS"]], ["2022", "2023"])
+
+
+class OpenMeteoSourceTests(unittest.TestCase):
+    def test_one_request_per_category_split_by_location(self) -> None:
+        calls = []
+
+        def fake_do_request(url, params, force_refresh=False):  # type: ignore[override]
+            calls.append(params)
+            latitudes = params["latitude"].split(",")
+            body = json.dumps([{"latitude": float(lat), "hourly": {"time": []}} for lat in latitudes]).encode()
+
+            class FakeResponse:
+                ok = True
+                status_code = 200
+                text = "{}"
+                content = body
+
+            return FakeResponse(), None, 5
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            source = OpenMeteoSource(executor)
+            with patch("src.sources.openmeteo._do_request", side_effect=fake_do_request):
+                results = source.fetch()
+
+        self.assertEqual(len(calls), 2, "Expected one weather and one air request")
+        expected = [
+            f"open-meteo-{category}-{loc.key}"
+            for loc in config.LOCATIONS
+            for category in ("weather", "air")
+        ]
+        self.assertEqual([result.source for result in results], expected)
+        self.assertEqual(
+            [(result.subtype, result.entity_key) for result in results],
+            [(category, loc.key) for loc in config.LOCATIONS for category in ("weather", "air")],
+        )
+        self.assertEqual(
+            [result.payload_json["latitude"] for result in results],
+            [loc.lat for loc in config.LOCATIONS for _ in ("weather", "air")],
+        )
+
+
+class WikipediaScraperTests(unittest.TestCase):
+    def setUp(self) -> None:
+        wikipedia._PARSE_CACHE.clear()
+
+    def tearDown(self) -> None:
+        wikipedia._PARSE_CACHE.clear()
+
+    def test_summary_api_used_when_available(self) -> None:
+        class FakeResponse:
+            ok = True
+            status_code = 200
+            text = "{}"
+
+            @property
+            def content(self):
+                return json.dumps(self.json()).encode()
+
+            def json(self):
+                return {"title": "Amsterdam", "extract": "Capital of the Netherlands."}
+
+        requested = []
+
+        def fake_do_request(url, params, force_refresh=False):
+            requested.append(url)
+            return FakeResponse(), None, 5
+
+        with patch("src.sources.wikipedia._do_request", side_effect=fake_do_request):
+            result = WikipediaScraper().scrape("https://en.wikipedia.org/wiki/Amsterdam")
+
+        self.assertEqual(requested, ["https://en.wikipedia.org/api/rest_v1/page/summary/Amsterdam"])
+        self.assertEqual(result.url, "https://en.wikipedia.org/wiki/Amsterdam")
+        self.assertEqual(result.parsed, {"title": "Amsterdam", "summary": "Capital of the Netherlands."})
+        self.assertTrue(result.ok)
+
+    def test_unchanged_page_reuses_previous_parse(self) -> None:
+        html = "<html><body><h1>Amsterdam</h1><p>Capital of the Netherlands.</p></body></html>"
+
+        class FakeResponse:
+            ok = True
+            status_code = 200
+            text = html
+            content = html.encode()
+
+        class NotFound:
+            ok = False
+            status_code = 404
+            text = "not found"
+
+        def fake_do_request(url, params, force_refresh=False):
+            if "/api/rest_v1/" in url:
+                return NotFound(), None, 5
+            return FakeResponse(), None, 5
+
+        url = "https://en.wikipedia.org/wiki/Amsterdam"
+        with patch("src.sources.wikipedia._do_request", side_effect=fake_do_request):
+            first = WikipediaScraper().scrape(url)
+            with patch("src.sources.wikipedia.BeautifulSoup") as soup:
+                second = WikipediaScraper().scrape(url)
 
-        self.assertIn("per_page", captured_params)
-        self.assertGreaterEqual(captured_params["per_page"], 1000)
-        self.assertEqual(result.params["per_page"], captured_params["per_page"])
+        soup.assert_not_called()
+        self.assertEqual(first.parsed, {"title": "Amsterdam", "summary": "Capital of the Netherlands."})
+        self.assertEqual(second.parsed, first.parsed)
+        self.assertTrue(second.ok)
 
 
 if __name__ == "__main__":